@@ -1,66 +1,83 @@
-import unittest
+import sys
+
+if __name__ == "__main__":
+    import run_tests
+    sys.exit(run_tests.main([__file__] + sys.argv[1:]))
+
 import requests
-import xmlrunner
-import os
 
+from common.base import ApiTestCase
+from common.paginate import PaginationError, iter_records
+from common.slowserver import SlowServer
 
-class TestReqresAPI(unittest.TestCase):
+
+class TestReqresAPI(ApiTestCase):
     BASE_URL = "https://reqres.in/api/users"
 
     def test_successful_response(self):
         """Test that the API returns a successful response."""
-        response = requests.get(f"{self.BASE_URL}?page=2")
+        response = self.client.get(f"{self.BASE_URL}?page=2")
         self.assertEqual(response.status_code, 200, "Expected status code 200")
 
     def test_response_json_structure(self):
         """Test that the response JSON has the expected structure."""
-        response = requests.get(f"{self.BASE_URL}?page=2")
-        json_data = response.json()
-
-        # Expected keys in the response
-        expected_keys = ["page", "per_page", "total", "total_pages", "data"]
-        self.assertTrue(all(key in json_data for key in expected_keys),
-                        "Response JSON does not have expected structure")
+        response = self.client.get(f"{self.BASE_URL}?page=2")
+        self.assertMatchesSchema(response.json(), "users_page",
+                                 "Response JSON does not have expected structure")
 
     def test_data_integrity(self):
         """Test that the data field in the response has the expected structure."""
-        response = requests.get(f"{self.BASE_URL}?page=2")
+        response = self.client.get(f"{self.BASE_URL}?page=2")
         json_data = response.json()
 
-        # Ensure 'data' is a list and contains dictionaries with specific keys
+        # Ensure 'data' is a list of users with the expected keys and types
         self.assertIsInstance(json_data['data'], list, "'data' should be a list")
-        if json_data['data']:
-            expected_data_keys = ["id", "email", "first_name", "last_name", "avatar"]
-            for user in json_data['data']:
-                self.assertTrue(all(key in user for key in expected_data_keys),
-                                "User data does not have expected keys")
+        self.assertMatchesSchema(json_data, "users_page", "User data does not have expected keys")
+
+    def test_all_pages_match_schema(self):
+        """Test that every page of the user list has the expected structure and no duplicates."""
+        total = self.client.get(f"{self.BASE_URL}?page=1").json()["total"]
+        seen_ids = set()
+        try:
+            for user in iter_records(self.client, self.BASE_URL):
+                self.assertNotIn(user["id"], seen_ids, f"User {user['id']} returned twice")
+                seen_ids.add(user["id"])
+        except PaginationError as error:
+            self.fail(str(error))
+        self.assertEqual(len(seen_ids), total, "Expected one record per user in 'total'")
 
     def test_invalid_page_parameter(self):
         """Test the API's behavior with an invalid page parameter."""
-        response = requests.get(f"{self.BASE_URL}?page=invalid")
+        response = self.client.get(f"{self.BASE_URL}?page=invalid")
         # Expected status code should be verified based on actual API behavior
        # self.assertNotEqual(response.status_code, 200, "Expected non-200 status code for invalid page parameter")
 
     def test_empty_response(self):
         """Test that the API returns an empty data list for a non-existent page."""
-        response = requests.get(f"{self.BASE_URL}?page=9999")
+        response = self.client.get(f"{self.BASE_URL}?page=9999")
         json_data = response.json()
 
         self.assertEqual(json_data['data'], [], "Expected 'data' to be an empty list for non-existent page")
 
     def test_timeout_scenario(self):
-        """Test the API's behavior under a timeout scenario."""
-        try:
-            response = requests.get(f"{self.BASE_URL}?page=2", timeout=0.001)
-        except requests.exceptions.Timeout:
-            self.assertTrue(True, "Expected timeout exception was raised")
-        else:
-            self.fail("Timeout exception was not raised")
+        """Test that a read timeout is raised when the server withholds its response."""
+        with SlowServer("slow_headers", delay=1) as server:
+            with self.assertRaises(requests.exceptions.ReadTimeout,
+                                   msg="Expected read timeout exception was not raised"):
+                server.session.get(server.url("/api/users?page=2"), timeout=0.05)
 
+    def test_connect_timeout_scenario(self):
+        """Test that a connect timeout is raised when the server never accepts the connection."""
+        with SlowServer("stall_connect") as server:
+            with self.assertRaises(requests.exceptions.ConnectTimeout,
+                                   msg="Expected connect timeout exception was not raised"):
+                server.session.get(server.url("/api/users?page=2"), timeout=0.05)
 
-if __name__ == "__main__":
-    if not os.path.exists('test-reports'):
-        os.makedirs('test-reports')
-
-    with open('test-reports/results.xml', 'wb') as output:
-        unittest.main(testRunner=xmlrunner.XMLTestRunner(output=output), failfast=False, buffer=False, catchbreak=False)
+    def test_slow_body_timeout_scenario(self):
+        """Test that a stalled response body fails the request once the read timeout expires."""
+        with SlowServer("slow_body", delay=1) as server:
+            # requests wraps read timeouts while downloading the body in
+            # ConnectionError; the message tells them apart from a refused connection
+            with self.assertRaisesRegex(requests.exceptions.ConnectionError, "Read timed out",
+                                        msg="Expected stalled body to time out"):
+                server.session.get(server.url("/api/users?page=2"), timeout=0.05)
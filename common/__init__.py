@@ -0,0 +1 @@
+"""Shared helpers for the Reqres API test suites."""
@@ -0,0 +1,329 @@
+"""Asyncio HTTP/1.1 transport for the pooled client.
+
+Selected with ``API_BACKEND=async`` or ``run_tests.py --backend async``. All
+network I/O of the run is multiplexed on one event loop running in a
+background thread, over a keep-alive connection pool per host. Requests are
+still built by ``requests`` (``PreparedRequest``) and answered with ordinary
+``requests.Response`` objects, and transport errors are raised as the same
+``requests.exceptions`` types the blocking backend raises.
+
+Synchronous test methods go through a ``requests.Session`` with
+``AsyncAdapter`` mounted, so redirects, cookies, hooks and ``verify`` /
+``cert`` are handled as usual while the adapter waits on
+``AsyncTransport.send``. Proxies are not supported and are ignored. Code that
+fans out many requests (such as the payload matrix) uses ``submit`` to have
+all of them in flight on the loop at once instead of occupying a thread
+each; those requests bypass the session and do not follow redirects.
+"""
+import asyncio
+import gzip
+import os
+import socket
+import ssl
+import threading
+import time
+import zlib
+from datetime import timedelta
+from http.client import HTTPMessage
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.exceptions import ConnectionError, ConnectTimeout, ReadTimeout, RequestException
+from requests.structures import CaseInsensitiveDict
+from requests.utils import default_headers
+
+from common.metrics import current_timings
+
+# Response statuses that never carry a body
+NO_BODY_STATUSES = {204, 304}
+
+# Content codings the transport can decode. requests' default Accept-Encoding
+# comes from urllib3 and also lists br/zstd when their decoders are available.
+ACCEPT_ENCODING = "gzip, deflate"
+DEFAULT_ACCEPT_ENCODING = default_headers()["Accept-Encoding"]
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class _HostConnections:
+    """Idle keep-alive connections and a limit on open ones for a single host."""
+
+    def __init__(self, limit):
+        self.idle = []
+        self.slots = asyncio.Semaphore(limit)
+        self.opened = 0
+
+
+class AsyncTransport:
+    """Event loop thread plus per-host keep-alive connection pools."""
+
+    def __init__(self, pool_size=10):
+        self.pool_size = pool_size
+        self.loop = asyncio.new_event_loop()
+        self._hosts = {}
+        self._ssl_contexts = {}
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def submit(self, prepared, timeout, timings=None, verify=True, cert=None):
+        """Schedule ``prepared`` on the loop; return a ``concurrent.futures.Future``."""
+        context = self._ssl_context(verify, cert) if prepared.url.startswith("https:") else None
+        return asyncio.run_coroutine_threadsafe(
+            self._send(prepared, timeout, timings if timings is not None else {}, context),
+            self.loop)
+
+    def send(self, prepared, timeout, timings=None, verify=True, cert=None):
+        """Send ``prepared`` and block the calling thread until its response is read."""
+        return self.submit(prepared, timeout, timings, verify, cert).result()
+
+    def _ssl_context(self, verify, cert):
+        """Return an ``SSLContext`` for requests' ``verify`` and ``cert`` arguments."""
+        key = (verify, cert if not isinstance(cert, list) else tuple(cert))
+        context = self._ssl_contexts.get(key)
+        if context is None:
+            if isinstance(verify, str):
+                context = ssl.create_default_context(
+                    cafile=None if os.path.isdir(verify) else verify,
+                    capath=verify if os.path.isdir(verify) else None)
+            else:
+                context = ssl.create_default_context()
+                if not verify:
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+            if isinstance(cert, (tuple, list)):
+                context.load_cert_chain(*cert)
+            elif cert:
+                context.load_cert_chain(cert)
+            context = self._ssl_contexts.setdefault(key, context)
+        return context
+
+    def connections_opened(self, host):
+        connections = self._hosts.get(host)
+        return connections.opened if connections else 0
+
+    def close(self):
+        async def close_idle():
+            for connections in self._hosts.values():
+                for connection in connections.idle:
+                    connection.close()
+                connections.idle.clear()
+        asyncio.run_coroutine_threadsafe(close_idle(), self.loop).result()
+
+    async def _open(self, parts, connections, connect_timeout, timings, prepared, context):
+        host = parts.hostname
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        try:
+            start = time.perf_counter()
+            infos = await self.loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            resolved = time.perf_counter()
+            # Try every resolved address in turn, as the blocking backend does
+            for position, info in enumerate(infos, 1):
+                try:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(info[4][0], port), connect_timeout)
+                    break
+                except (OSError, asyncio.TimeoutError):
+                    if position == len(infos):
+                        raise
+            connected = time.perf_counter()
+            if parts.scheme == "https":
+                await asyncio.wait_for(writer.start_tls(context, server_hostname=host),
+                                       connect_timeout)
+                timings["tls"] = time.perf_counter() - connected
+        except asyncio.TimeoutError:
+            raise ConnectTimeout(f"Connection to {parts.netloc} timed out", request=prepared)
+        except OSError as error:
+            raise ConnectionError(error, request=prepared)
+        timings["dns"] = resolved - start
+        timings["connect"] = connected - resolved
+        connections.opened += 1
+        return _Connection(reader, writer)
+
+    async def _send(self, prepared, timeout, timings, context=None):
+        # Like requests, elapsed time runs from here to the response headers,
+        # connection set-up included
+        started = time.perf_counter()
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+        else:
+            connect_timeout = read_timeout = timeout
+        parts = urlsplit(prepared.url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        connections = self._hosts.get(host)
+        if connections is None:
+            connections = self._hosts[host] = _HostConnections(self.pool_size)
+
+        async with connections.slots:
+            connection = connections.idle.pop() if connections.idle else None
+            try:
+                response = None
+                if connection is not None:
+                    try:
+                        response, keep_alive = await self._exchange(
+                            connection, prepared, parts, read_timeout, started)
+                    except (asyncio.IncompleteReadError, ConnectionResetError, BrokenPipeError):
+                        # The server closed the idle keep-alive connection; use a new one
+                        connection.close()
+                        connection = None
+                if response is None:
+                    connection = await self._open(parts, connections, connect_timeout,
+                                                  timings, prepared, context)
+                    response, keep_alive = await self._exchange(
+                        connection, prepared, parts, read_timeout, started)
+            except RequestException:
+                if connection is not None:
+                    connection.close()
+                raise
+            except asyncio.TimeoutError:
+                connection.close()
+                raise ReadTimeout(f"{parts.netloc}: Read timed out. (read timeout={read_timeout})",
+                                  request=prepared)
+            except (OSError, asyncio.IncompleteReadError) as error:
+                connection.close()
+                raise ConnectionError(error, request=prepared)
+            except BaseException:
+                if connection is not None:
+                    connection.close()
+                raise
+            if keep_alive:
+                connections.idle.append(connection)
+            else:
+                connection.close()
+            return response
+
+    async def _exchange(self, connection, prepared, parts, read_timeout, started):
+        body = prepared.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        path = prepared.path_url
+        headers = CaseInsensitiveDict(prepared.headers)
+        headers.setdefault("Host", parts.netloc)
+        if headers.get("Accept-Encoding") == DEFAULT_ACCEPT_ENCODING:
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
+        if body or prepared.method not in ("GET", "HEAD", "DELETE"):
+            headers["Content-Length"] = str(len(body))
+        head = f"{prepared.method} {path} HTTP/1.1\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+
+        connection.writer.write(head.encode("latin-1") + body)
+        await connection.writer.drain()
+        status, reason, response_headers, message = await asyncio.wait_for(
+            self._read_head(connection.reader), read_timeout)
+        elapsed = time.perf_counter() - started
+        content = b""
+        if prepared.method != "HEAD" and status not in NO_BODY_STATUSES:
+            try:
+                content = await asyncio.wait_for(
+                    self._read_body(connection.reader, response_headers), read_timeout)
+            except asyncio.TimeoutError:
+                # requests reads the body after returning from the adapter and
+                # reports a stall there as ConnectionError, not ReadTimeout
+                raise ConnectionError(
+                    f"{parts.netloc}: Read timed out. (read timeout={read_timeout})",
+                    request=prepared)
+        keep_alive = (response_headers.get("Connection", "").lower() != "close"
+                      and ("Content-Length" in response_headers
+                           or "chunked" in response_headers.get("Transfer-Encoding", "")
+                           or not content))
+
+        encoding = response_headers.get("Content-Encoding", "")
+        if encoding == "gzip":
+            content = gzip.decompress(content)
+        elif encoding == "deflate":
+            content = zlib.decompress(content)
+
+        response = Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = response_headers
+        response._content = content
+        response._content_consumed = True
+        # Enough of a urllib3 response for requests' cookie extraction
+        response.raw = SimpleNamespace(_original_response=SimpleNamespace(msg=message))
+        response.encoding = None
+        response.url = prepared.url
+        response.request = prepared
+        response.elapsed = timedelta(seconds=elapsed)
+        return response, keep_alive
+
+    @staticmethod
+    async def _read_head(reader):
+        status_line = (await reader.readuntil(b"\r\n")).decode("latin-1").rstrip("\r\n")
+        _, status, *reason = status_line.split(" ", 2)
+        headers = CaseInsensitiveDict()
+        message = HTTPMessage()
+        while True:
+            line = (await reader.readuntil(b"\r\n")).decode("latin-1").rstrip("\r\n")
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            name, value = name.strip(), value.strip()
+            # Repeated headers are joined as urllib3 does; the message keeps each one
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+            message[name] = value
+        return int(status), reason[0] if reason else "", headers, message
+
+    @staticmethod
+    async def _read_body(reader, headers):
+        if "chunked" in headers.get("Transfer-Encoding", ""):
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    # Skip trailers up to the final empty line
+                    while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                        pass
+                    return b"".join(chunks)
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+        if "Content-Length" in headers:
+            return await reader.readexactly(int(headers["Content-Length"]))
+        return await reader.read()
+
+
+class AsyncAdapter(BaseAdapter):
+    """``requests`` transport adapter sending through an ``AsyncTransport``."""
+
+    def __init__(self, transport):
+        super().__init__()
+        self.transport = transport
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        response = self.transport.send(request, timeout, current_timings(), verify, cert)
+        extract_cookies_to_jar(response.cookies, request, response.raw)
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport(pool_size):
+    """Return the run-wide ``AsyncTransport``, starting its loop once."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = AsyncTransport(pool_size)
+        return _transport
+
+
+def close_transport():
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+            _transport = None
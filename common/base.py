@@ -0,0 +1,111 @@
+"""Base ``TestCase`` shared by the Reqres API suites.
+
+The HTTP stack (``common.client`` and with it requests and urllib3) is
+imported when a suite class is set up rather than when this module is, so
+importing a suite stays cheap until its tests actually run.
+"""
+import unittest
+
+from common.config import settings
+from common.schema import validator
+
+# Origin hard-coded in the suites' BASE_URL; rewritten to the configured target
+REQRES_ORIGIN = "https://reqres.in"
+
+# Filled in as suites finish; exported as JUnit testsuite properties
+REPORT_PROPERTIES = {}
+
+
+def serial(test_method):
+    """Mark a test method as order-sensitive so runners never run it concurrently."""
+    test_method.serial = True
+    return test_method
+
+
+def is_serial(test):
+    """Return True if ``test`` (a ``TestCase`` instance) must run on its own."""
+    method = getattr(test, test._testMethodName, None)
+    return getattr(method, "serial", False) or getattr(test, "SERIAL", False)
+
+
+def target_origin():
+    """Return the origin requests should go to, starting the local server if asked."""
+    if settings.local_server:
+        from common.server import ensure_local_server
+        return ensure_local_server()
+    return settings.base_origin
+
+
+def record_run_stats():
+    """Copy the current client counters and latencies into ``REPORT_PROPERTIES``."""
+    from common.client import connection_stats, get_response_cache, get_snapshots, policy_stats
+    from common.metrics import recorder
+    for host, stats in connection_stats().items():
+        REPORT_PROPERTIES[f"{host} requests sent"] = stats["requests"]
+        REPORT_PROPERTIES[f"{host} connections opened"] = stats["connections"]
+    cache = get_response_cache()
+    if cache is not None:
+        REPORT_PROPERTIES["response cache hits"] = cache.hits
+        REPORT_PROPERTIES["response cache misses"] = cache.misses
+    for name, value in policy_stats().items():
+        REPORT_PROPERTIES[f"policy {name}"] = value
+    snapshots = get_snapshots()
+    if snapshots is not None:
+        for name, value in snapshots.stats().items():
+            REPORT_PROPERTIES[f"snapshots {name}"] = value
+    REPORT_PROPERTIES.update(recorder.properties())
+
+
+class ApiTestCase(unittest.TestCase):
+    """Gives every suite a pooled ``self.client`` created once per class.
+
+    Suites may override ``TIMEOUT`` and ``HEADERS`` to change the defaults
+    applied to every request they send. A ``BASE_URL`` on reqres.in is
+    rewritten to the configured target, and ``API_ROOT`` points at its
+    ``/api`` prefix.
+    """
+    TIMEOUT = None
+    HEADERS = {}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from common.client import ApiClient
+        origin = target_origin()
+        cls.API_ROOT = f"{origin}/api"
+        base_url = getattr(cls, "BASE_URL", None)
+        if base_url and base_url.startswith(REQRES_ORIGIN):
+            cls.BASE_URL = origin + base_url[len(REQRES_ORIGIN):]
+        cls.client = ApiClient(timeout=cls.TIMEOUT, headers=cls.HEADERS)
+
+    def setUp(self):
+        super().setUp()
+        from common import impact
+        from common.client import get_snapshots
+        # Attribute the requests sent by this test to it in the impact index
+        impact.set_current(impact.test_id(self))
+        self.addCleanup(impact.set_current, None)
+        if get_snapshots() is not None:
+            self.addCleanup(self.assertSnapshotsMatch)
+
+    def assertSnapshotsMatch(self):
+        """Fail with every baseline difference found in this test's responses."""
+        from common import impact
+        from common.client import get_snapshots
+        differences = get_snapshots().take_mismatches(impact.test_id(self))
+        if differences:
+            self.fail("Responses differ from their snapshots:\n" + "\n".join(differences))
+
+    def assertMatchesSchema(self, data, schema_name, msg=None):
+        """Fail listing every path of ``data`` that does not match the named schema."""
+        errors = validator(schema_name)(data)
+        if errors:
+            detail = "\n  ".join(errors[:20])
+            more = f"\n  ... {len(errors) - 20} more" if len(errors) > 20 else ""
+            self.fail(self._formatMessage(msg, f"Response does not match schema "
+                                               f"'{schema_name}':\n  {detail}{more}"))
+
+    @classmethod
+    def tearDownClass(cls):
+        record_run_stats()
+        super().tearDownClass()
@@ -0,0 +1,122 @@
+"""Payload size scaling benchmark for the POST and PUT endpoints.
+
+For each dimension (number of keys, string length, nesting depth) and size the
+payload is built once and sent ``repeat`` times. Each sample measures
+client-side encoding, optional gzip compression, bytes on the wire, time to
+first byte, server time (from a ``Server-Timing: app;dur=`` header when the
+server sends one, as the local stand-in does) and response decoding. The
+median of every measure is kept, giving one point of the scaling curve.
+"""
+import gzip
+import json
+import re
+import statistics
+import time
+
+DIMENSIONS = ("keys", "string", "depth")
+
+DEFAULT_SIZES = {
+    "keys": (10, 100, 1000, 10000, 100000),
+    "string": (100, 1000, 10000, 100000, 1000000),
+    # Deep nesting hits recursion limits in most JSON parsers long before megabytes
+    "depth": (1, 10, 50, 100, 500),
+}
+
+
+def json_codecs():
+    """Return ``{name: (encode, decode)}`` for stdlib json and any faster encoder installed."""
+    codecs = {"json": (lambda value: json.dumps(value).encode(), json.loads)}
+    try:
+        import orjson
+        codecs["orjson"] = (orjson.dumps, orjson.loads)
+    except ImportError:
+        pass
+    try:
+        import ujson
+        codecs["ujson"] = (lambda value: ujson.dumps(value).encode(), ujson.loads)
+    except ImportError:
+        pass
+    return codecs
+
+
+def build_payload(dimension, size):
+    """Return a payload with ``name`` and ``job`` grown along ``dimension``."""
+    payload = {"name": "benchmark", "job": "payload"}
+    if dimension == "keys":
+        payload.update({f"key{i}": "value" for i in range(size)})
+    elif dimension == "string":
+        payload["name"] = "a" * size
+    elif dimension == "depth":
+        nested = {}
+        for _ in range(size):
+            nested = {"child": nested}
+        payload["nested"] = nested
+    else:
+        raise ValueError(f"Unknown dimension {dimension!r}, expected one of {DIMENSIONS}")
+    return payload
+
+
+def _server_ms(response):
+    match = re.search(r"dur=([\d.]+)", response.headers.get("Server-Timing", ""))
+    return float(match.group(1)) if match else None
+
+
+def measure(client, method, url, payload, codec, compress=False, repeat=5):
+    """Send ``payload`` ``repeat`` times and return the median of each measure."""
+    encode, decode = codec
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = encode(payload)
+        encoded = time.perf_counter()
+        headers = {"Content-Type": "application/json"}
+        if compress:
+            wire = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        else:
+            wire = body
+        compressed = time.perf_counter()
+        response = client.request(method, url, data=wire, headers=headers)
+        received = time.perf_counter()
+        decode_start = time.perf_counter()
+        ok = response.status_code < 400
+        if ok and response.content:
+            decode(response.content)
+        decoded = time.perf_counter()
+        samples.append({
+            "status": response.status_code,
+            "encode_ms": (encoded - start) * 1000,
+            "compress_ms": (compressed - encoded) * 1000,
+            "request_bytes": len(body),
+            "wire_bytes": len(wire),
+            "ttfb_ms": response.elapsed.total_seconds() * 1000,
+            "server_ms": _server_ms(response),
+            "response_bytes": len(response.content),
+            "decode_ms": (decoded - decode_start) * 1000,
+            "total_ms": (decoded - start) * 1000,
+            "round_trip_ms": (received - compressed) * 1000,
+        })
+
+    point = {"status": samples[-1]["status"]}
+    for key in samples[0]:
+        if key == "status":
+            continue
+        values = [sample[key] for sample in samples if sample[key] is not None]
+        point[key] = round(statistics.median(values), 3) if values else None
+    return point
+
+
+def sweep(client, method, url, dimensions, sizes, codecs, compress_modes=(False,), repeat=5):
+    """Yield one result row per dimension, size, codec and compression mode."""
+    for dimension in dimensions:
+        for size in sizes.get(dimension, DEFAULT_SIZES[dimension]):
+            payload = build_payload(dimension, size)
+            for codec_name, codec in codecs.items():
+                for compress in compress_modes:
+                    try:
+                        point = measure(client, method, url, payload, codec, compress, repeat)
+                        error = None
+                    except Exception as exc:
+                        point, error = {}, f"{type(exc).__name__}: {exc}"
+                    yield {"dimension": dimension, "size": size, "codec": codec_name,
+                           "gzip": compress, "error": error, **point}
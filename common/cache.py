@@ -0,0 +1,88 @@
+"""Per-run cache for idempotent GET/HEAD responses.
+
+Several test methods assert different things about the same fixture (for
+example ``GET /api/users?page=2``). With the cache enabled the fixture is
+fetched and its JSON decoded once; later callers receive the same response
+object, whose ``json()`` returns the already parsed body.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from requests.models import RequestEncodingMixin
+
+CACHEABLE_METHODS = ("GET", "HEAD")
+
+
+def cache_key(method, url, headers=None, params=None):
+    """Build a hashable key from the request method, URL, headers and params.
+
+    ``params`` may take any form requests accepts (dict, list of pairs,
+    string); it is encoded the way requests encodes it into the query string.
+    """
+    if isinstance(params, dict):
+        params = sorted(params.items())
+    return (method.upper(), url,
+            tuple(sorted((headers or {}).items())),
+            RequestEncodingMixin._encode_params(params) if params else "")
+
+
+def memoize_json(response):
+    """Decode the response body once and make ``response.json()`` return it."""
+    try:
+        body = response.json()
+    except ValueError:
+        return response
+    response.json = lambda **kwargs: body
+    return response
+
+
+class ResponseCache:
+    """Thread-safe LRU cache bounded by entry count, with a per-entry TTL.
+
+    Concurrent requests for a key that is being fetched wait for the first
+    fetch instead of sending their own request.
+    """
+
+    def __init__(self, max_entries=256, ttl=60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, key, fetch):
+        """Return the cached response for ``key``, calling ``fetch()`` on a miss."""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            event.wait()
+
+        try:
+            response = memoize_json(fetch())
+            if response.ok:
+                with self._lock:
+                    self._entries[key] = (time.monotonic() + self.ttl, response)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            return response
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
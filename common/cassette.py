@@ -0,0 +1,165 @@
+"""Record and replay HTTP exchanges through a JSONL cassette.
+
+In record mode every exchange sent through the pooled client is appended to
+the cassette as one JSON line as soon as it completes. In replay mode the
+cassette is loaded into an in-memory index and responses are served from it
+without touching the network.
+
+Exchanges are matched on method, path with query string and a hash of the
+request body; the origin is ignored so a cassette recorded against the local
+stand-in server replays against any target. Identical requests recorded
+several times (e.g. duplicate user creation) are replayed in recorded order,
+repeating the last response once the sequence is exhausted.
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import zlib
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
+
+
+def exchange_key(method, url, body):
+    """Return the lookup key for a request, independent of its origin."""
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    if isinstance(body, str):
+        body = body.encode()
+    digest = hashlib.sha1(body or b"").hexdigest()
+    return f"{method.upper()} {path} {digest}"
+
+
+def encode_body(data, compress=False):
+    """Return ``(text, encoding)`` suitable for storing ``data`` in JSON."""
+    if not data:
+        return "", "utf-8"
+    if compress:
+        return base64.b64encode(zlib.compress(data)).decode("ascii"), "zlib+base64"
+    try:
+        return data.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        return base64.b64encode(data).decode("ascii"), "base64"
+
+
+def decode_body(text, encoding):
+    if encoding == "zlib+base64":
+        return zlib.decompress(base64.b64decode(text))
+    if encoding == "base64":
+        return base64.b64decode(text)
+    return text.encode("utf-8")
+
+
+class Cassette:
+    """Append-only JSONL file of recorded exchanges."""
+
+    def __init__(self, path, compress=False):
+        self.path = path
+        self.compress = compress
+        self._lock = threading.Lock()
+        self._file = None
+
+    def append(self, request, response):
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode()
+        request_body, request_encoding = encode_body(body, self.compress)
+        response_body, response_encoding = encode_body(response.content, self.compress)
+        line = json.dumps({
+            "key": exchange_key(request.method, request.url, body),
+            "request": {"method": request.method, "url": request.url,
+                        "body": request_body, "encoding": request_encoding},
+            "response": {"status": response.status_code, "reason": response.reason,
+                         "headers": dict(response.headers),
+                         "body": response_body, "encoding": response_encoding,
+                         "elapsed": response.elapsed.total_seconds()},
+        })
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def load(self):
+        """Return ``{key: [response, ...]}`` built by streaming the file."""
+        index = {}
+        with open(self.path, encoding="utf-8") as cassette:
+            for line in cassette:
+                if line.strip():
+                    exchange = json.loads(line)
+                    index.setdefault(exchange["key"], []).append(exchange["response"])
+        return index
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Pooled ``HTTPAdapter`` that appends every completed exchange to a cassette."""
+
+    def __init__(self, cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.cassette.append(request, response)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Adapter answering requests from a cassette index, never the network."""
+
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        key = exchange_key(request.method, request.url, request.body)
+        recorded = self.index.get(key)
+        if not recorded:
+            raise ConnectionError(f"No recorded response for {key}", request=request)
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        stored = recorded[min(position, len(recorded) - 1)]
+
+        response = Response()
+        response.status_code = stored["status"]
+        response.reason = stored["reason"]
+        response.headers = CaseInsensitiveDict(stored["headers"])
+        response._content = decode_body(stored["body"], stored["encoding"])
+        response.encoding = "utf-8"
+        response.elapsed = timedelta(seconds=stored["elapsed"])
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+_cassette = None
+_index = None
+_lock = threading.Lock()
+
+
+def make_adapter(mode, path, compress=False, **kwargs):
+    """Return the adapter for ``mode`` ("record" or "replay"), sharing one cassette."""
+    global _cassette, _index
+    with _lock:
+        if mode == "record":
+            if _cassette is None:
+                _cassette = Cassette(path, compress)
+            return RecordingAdapter(_cassette, **kwargs)
+        if mode == "replay":
+            if _index is None:
+                _index = Cassette(path).load()
+            return ReplayAdapter(_index)
+    raise ValueError(f"Unknown cassette mode: {mode!r}")
@@ -0,0 +1,288 @@
+"""Pooled HTTP client shared by every test suite.
+
+A single keep-alive ``requests.Session`` is kept per base host
+(``scheme://host[:port]``), so test methods reuse connections instead of
+paying a new TCP and TLS handshake for each call. Each suite gets its own
+``ApiClient`` carrying that suite's default timeout and headers, while the
+underlying connection pools are shared across suites hitting the same host.
+
+With ``settings.backend == "async"`` the sessions send through the asyncio
+transport in ``common.aio`` instead of urllib3 (cassette modes always use
+their own ``requests`` adapters).
+"""
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.cache import CACHEABLE_METHODS, ResponseCache, cache_key
+from common.cassette import make_adapter
+from common.config import settings
+from common.impact import current as current_test, index as impact_index
+from common.metrics import instrument, recorder, start_request
+from common.policy import HostLimiters, RetryBudget, RetryPolicy
+from common.snapshot import SnapshotStore
+
+
+class HostPool:
+    """Keep-alive session and request counter for a single host."""
+
+    def __init__(self, host, pool_size):
+        self.host = host
+        self.session = requests.Session()
+        if settings.cassette_mode:
+            self.adapter = make_adapter(settings.cassette_mode, settings.cassette_path,
+                                        settings.cassette_compress,
+                                        pool_connections=1, pool_maxsize=pool_size)
+        elif use_async_backend():
+            from common.aio import AsyncAdapter
+            self.adapter = AsyncAdapter(_transport())
+        else:
+            self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        instrument(self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.requests_sent = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests_sent += 1
+
+    def connections_opened(self):
+        """Return the number of connections opened for this host."""
+        if use_async_backend():
+            return _transport().connections_opened(self.host)
+        if not hasattr(self.adapter, "poolmanager"):
+            return 0
+        pools = self.adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def close(self):
+        self.session.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_response_cache = None
+_limiters = None
+_retry_policy = None
+_snapshots = None
+
+
+def _host_of(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def use_async_backend():
+    return settings.backend == "async" and not settings.cassette_mode
+
+
+def _transport():
+    """Return the asyncio transport, importing it on first use.
+
+    The import is deferred so runs on the default backend never load asyncio.
+    """
+    from common.aio import get_transport
+    return get_transport(settings.pool_size)
+
+
+def get_pool(url):
+    """Return the shared ``HostPool`` for the host of ``url``, creating it once."""
+    host = _host_of(url)
+    with _pools_lock:
+        pool = _pools.get(host)
+        if pool is None:
+            pool = _pools[host] = HostPool(host, settings.pool_size)
+        return pool
+
+
+def get_response_cache():
+    """Return the run-wide ``ResponseCache``, or None when caching is disabled."""
+    global _response_cache
+    if not settings.response_cache:
+        return None
+    with _pools_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(settings.cache_size, settings.cache_ttl)
+        return _response_cache
+
+
+def get_snapshots():
+    """Return the run-wide ``SnapshotStore``, or None when snapshots are disabled."""
+    global _snapshots
+    if not settings.snapshot_mode:
+        return None
+    with _pools_lock:
+        if _snapshots is None:
+            _snapshots = SnapshotStore(settings.snapshot_dir, settings.snapshot_mode)
+        return _snapshots
+
+
+def get_policy():
+    """Return the run-wide ``(HostLimiters, RetryPolicy)``, created from settings once."""
+    global _limiters, _retry_policy
+    with _pools_lock:
+        if _retry_policy is None:
+            _limiters = HostLimiters(settings.rate_limit, settings.rate_burst)
+            _retry_policy = RetryPolicy(settings.max_retries,
+                                        budget=RetryBudget(settings.retry_budget))
+        return _limiters, _retry_policy
+
+
+def policy_stats():
+    """Return the retry budget and rate limiting counters of the run."""
+    limiters, policy = get_policy()
+    return {"requests": policy.budget.requests, "retries": policy.budget.retries,
+            "retries denied by budget": policy.budget.denied,
+            "rate limit wait (s)": round(limiters.waited, 3)}
+
+
+def connection_stats():
+    """Return ``{host: {"requests": n, "connections": m}}`` for every pool used."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.host: {"requests": pool.requests_sent,
+                        "connections": pool.connections_opened()}
+            for pool in pools}
+
+
+def close_all():
+    """Close every pooled session (used at interpreter shutdown by runners)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+    aio = sys.modules.get("common.aio")
+    if aio is not None:
+        aio.close_transport()
+
+
+def _prepare(pool, method, url, kwargs):
+    """Build the ``PreparedRequest`` requests itself would send for these arguments."""
+    options = {key: kwargs[key] for key in ("headers", "params", "json", "data", "auth",
+                                            "files", "cookies") if key in kwargs}
+    return pool.session.prepare_request(requests.Request(method, url, **options))
+
+
+def _record(method, url, timings, start, response, stream=False):
+    timings["total"] = time.perf_counter() - start
+    # elapsed includes opening a new connection; count that time only once,
+    # under dns/connect/tls
+    setup = sum(timings.get(phase, 0.0) for phase in ("dns", "connect", "tls"))
+    timings["ttfb"] = max(response.elapsed.total_seconds() - setup, 0.0)
+    if stream:
+        received = int(response.headers.get("Content-Length") or 0)
+    else:
+        received = len(response.content)
+    recorder.add(method, url, timings, len(response.request.body or b""), received)
+
+
+def check_snapshot(method, response, stream=False):
+    """Record or compare ``response`` against its snapshot for the current test."""
+    snapshots = get_snapshots()
+    if snapshots is not None and not stream:
+        snapshots.check(method, response, current_test())
+
+
+class ApiClient:
+    """Per-suite view on the shared pools with default timeout and headers."""
+
+    def __init__(self, timeout=None, headers=None):
+        self.timeout = timeout if timeout is not None else settings.default_timeout
+        self.headers = dict(headers or {})
+
+    def request(self, method, url, **kwargs):
+        impact_index.observe(method, url)
+        # Requests with an explicit timeout or extra options (auth, body,
+        # streaming) are never served from the cache.
+        cacheable = (method.upper() in CACHEABLE_METHODS
+                     and set(kwargs) <= {"headers", "params"})
+        kwargs.setdefault("timeout", self.timeout)
+        if self.headers:
+            kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {})}
+
+        cache = get_response_cache() if cacheable else None
+        if cache is None:
+            return self._send(method, url, kwargs)
+        key = cache_key(method, url, kwargs.get("headers"), kwargs.get("params"))
+        return cache.get_or_fetch(key, lambda: self._send(method, url, kwargs))
+
+    @staticmethod
+    def _send(method, url, kwargs):
+        pool = get_pool(url)
+        limiters, policy = get_policy()
+        attempt = 0
+        while True:
+            limiters.acquire(pool.host)
+            pool.count_request()
+            policy.budget.count_request()
+            response = error = None
+            try:
+                response = ApiClient._send_once(pool, method, url, kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout) as exc:
+                error = exc
+            if not policy.should_retry(method, attempt, response, error):
+                if error is not None:
+                    raise error
+                check_snapshot(method, response, kwargs.get("stream"))
+                return response
+            time.sleep(policy.delay(attempt, response))
+            attempt += 1
+
+    @staticmethod
+    def _send_once(pool, method, url, kwargs):
+        timings = start_request()
+        start = time.perf_counter()
+        response = pool.session.request(method, url, **kwargs)
+        _record(method, url, timings, start, response, kwargs.get("stream"))
+        return response
+
+    def submit(self, method, url, **kwargs):
+        """Send a request on the async backend without blocking; return a future.
+
+        Only available with the async backend; callers fall back to threads
+        otherwise. Submitted requests are rate limited but not retried, and
+        they bypass the session, so redirects are not followed. Snapshots are
+        not checked here, to keep blob I/O off the event loop; callers pass
+        the result to ``check_snapshot``.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if self.headers:
+            kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {})}
+        impact_index.observe(method, url)
+        pool = get_pool(url)
+        limiters, policy = get_policy()
+        limiters.acquire(pool.host)
+        pool.count_request()
+        policy.budget.count_request()
+        timings = {}
+        start = time.perf_counter()
+        future = _transport().submit(
+            _prepare(pool, method, url, kwargs), kwargs["timeout"], timings)
+
+        def record(done):
+            if not done.exception():
+                _record(method, url, timings, start, done.result())
+        future.add_done_callback(record)
+        return future
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
@@ -0,0 +1,59 @@
+"""Run-wide settings for the API test suites.
+
+Values are read from environment variables once at import time so that a
+suite started directly (``python putapis/userput.py``) and a suite started by
+a runner behave the same. Runners may override the attributes of ``settings``
+before any test class is set up.
+"""
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+class Settings:
+    """Mutable container for run-wide options."""
+
+    def __init__(self):
+        # Origin every suite sends its requests to
+        self.base_origin = os.environ.get("REQRES_BASE_URL", "https://reqres.in").rstrip("/")
+        # Start the in-process stand-in server and point the suites at it
+        self.local_server = os.environ.get("API_LOCAL_SERVER") == "1"
+        # "record" appends every exchange to the cassette, "replay" serves from it
+        self.cassette_mode = os.environ.get("API_CASSETTE_MODE") or None
+        self.cassette_path = os.environ.get("API_CASSETTE",
+                                            os.path.join("cassettes", "requests.jsonl"))
+        self.cassette_compress = os.environ.get("API_CASSETTE_COMPRESS") == "1"
+        # HTTP backend: "requests" (blocking urllib3 pools) or "async" (common.aio)
+        self.backend = os.environ.get("API_BACKEND", "requests")
+        # "record" stores response baselines, "check" compares responses with them
+        self.snapshot_mode = os.environ.get("API_SNAPSHOT") or None
+        self.snapshot_dir = os.environ.get("API_SNAPSHOT_DIR", "snapshots")
+        # Requests per second allowed per host (0 disables rate limiting) and burst size
+        self.rate_limit = _env_float("API_RATE_LIMIT", 0.0)
+        self.rate_burst = _env_int("API_RATE_BURST", 10)
+        # Retries of idempotent requests and the share of requests they may add
+        self.max_retries = _env_int("API_MAX_RETRIES", 2)
+        self.retry_budget = _env_float("API_RETRY_BUDGET", 0.1)
+        # Maximum number of keep-alive connections kept per host
+        self.pool_size = _env_int("API_POOL_SIZE", 10)
+        # Timeout (seconds) applied when a suite does not define its own
+        self.default_timeout = _env_float("API_TIMEOUT", 30.0)
+        # Number of test methods run concurrently by run_tests.py
+        self.workers = _env_int("API_WORKERS", 8)
+        # Number of past runs kept under test-reports/runs
+        self.report_history = _env_int("API_REPORT_HISTORY", 20)
+        # Opt-in cache of GET/HEAD responses shared by all test methods
+        self.response_cache = os.environ.get("API_RESPONSE_CACHE") == "1"
+        self.cache_ttl = _env_float("API_CACHE_TTL", 60.0)
+        self.cache_size = _env_int("API_CACHE_SIZE", 256)
+
+
+settings = Settings()
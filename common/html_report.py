@@ -0,0 +1,183 @@
+"""HTML report rendered directly from streamed test results.
+
+Replaces the junit2html step: rows are rendered once as results arrive, each
+test class is a section that is only re-rendered when it received new results,
+and pass/fail trends come from a small ``summary.json`` cached in every run
+directory instead of re-reading old reports. The page also shows the latency
+percentiles and histograms of the run.
+
+Rebuild the page of a stored run with ``python -m common.html_report <run dir>``.
+"""
+import json
+import os
+import sys
+from html import escape
+
+SUMMARY = "summary.json"
+HTML = "results.html"
+
+STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin-bottom: 1.5em; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; text-align: left; vertical-align: top; }
+.success { color: #1a7f37; } .failure, .error { color: #cf222e; } .skipped { color: #9a6700; }
+.bar { display: inline-block; background: #54aeff; height: 10px; }
+.bar.failed { background: #cf222e; }
+.hist { display: inline-flex; align-items: flex-end; height: 32px; gap: 1px; }
+.hist span { display: inline-block; width: 6px; background: #54aeff; }
+pre { white-space: pre-wrap; margin: 0; font-size: 12px; }
+"""
+
+
+def summarize(results):
+    """Return outcome counts and total time for an iterable of result dicts."""
+    summary = {"tests": 0, "success": 0, "failure": 0, "error": 0, "skipped": 0, "time": 0.0}
+    for result in results:
+        summary["tests"] += 1
+        summary[result["outcome"]] = summary.get(result["outcome"], 0) + 1
+        summary["time"] += result["time"]
+    summary["time"] = round(summary["time"], 3)
+    return summary
+
+
+def run_summary(run_dir):
+    """Return the cached outcome summary of a stored run, computing it once."""
+    path = os.path.join(run_dir, SUMMARY)
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as cached:
+            return json.load(cached)
+    from common.reporting import RESULTS, read_records
+    summary = summarize(read_records(os.path.join(run_dir, RESULTS)))
+    write_summary(run_dir, summary)
+    return summary
+
+
+def write_summary(run_dir, summary):
+    with open(os.path.join(run_dir, SUMMARY), "w", encoding="utf-8") as output:
+        json.dump(summary, output)
+
+
+def _row(result):
+    details = ""
+    if result["outcome"] != "success":
+        details = f"<pre>{escape(result.get('details') or result.get('message') or '')}</pre>"
+    return (f"<tr><td>{escape(result['name'])}</td>"
+            f"<td class=\"{result['outcome']}\">{result['outcome']}</td>"
+            f"<td>{result['time']:.3f}</td>"
+            f"<td>{escape(result.get('doc') or '')}{details}</td></tr>")
+
+
+class Section:
+    """Rendered rows and cached HTML of one test class."""
+
+    def __init__(self, classname):
+        self.classname = classname
+        self.rows = []
+        self.counts = {}
+        self.html = ""
+        self.dirty = True
+
+    def add(self, result):
+        self.rows.append(_row(result))
+        self.counts[result["outcome"]] = self.counts.get(result["outcome"], 0) + 1
+        self.dirty = True
+
+    def render(self):
+        if self.dirty:
+            counts = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.counts.items()))
+            self.html = (f"<h2>{escape(self.classname)}</h2><p>{counts}</p>"
+                         "<table><tr><th>Test</th><th>Outcome</th><th>Time (s)</th>"
+                         "<th>Description</th></tr>" + "".join(self.rows) + "</table>")
+            self.dirty = False
+        return self.html
+
+
+def _trends_html(summaries):
+    if not summaries:
+        return ""
+    widest = max(summary["tests"] for _, summary in summaries) or 1
+    rows = []
+    for run_id, summary in summaries:
+        failed = summary.get("failure", 0) + summary.get("error", 0)
+        passed = summary.get("success", 0)
+        rows.append(
+            f"<tr><td>{escape(run_id)}</td><td>{summary['tests']}</td><td>{passed}</td>"
+            f"<td>{failed}</td><td>{summary['time']:.3f}</td><td>"
+            f"<span class=\"bar\" style=\"width:{200 * passed // widest}px\"></span>"
+            f"<span class=\"bar failed\" style=\"width:{200 * failed // widest}px\"></span>"
+            "</td></tr>")
+    return ("<h2>Trend</h2><table><tr><th>Run</th><th>Tests</th><th>Passed</th>"
+            "<th>Failed</th><th>Time (s)</th><th></th></tr>" + "".join(rows) + "</table>")
+
+
+def _latency_html(latency):
+    if not latency:
+        return ""
+    rows = []
+    for endpoint, stats in latency.items():
+        total = stats.get("total")
+        if not total:
+            continue
+        histogram = total.get("histogram", [])
+        tallest = max((count for _, count in histogram), default=1)
+        bars = "".join(f"<span title=\"&le;{upper} ms: {count}\" "
+                       f"style=\"height:{max(32 * count // tallest, 1)}px\"></span>"
+                       for upper, count in histogram)
+        rows.append(f"<tr><td>{escape(endpoint)}</td><td>{total['count']}</td>"
+                    f"<td>{total['p50_ms']}</td><td>{total['p90_ms']}</td>"
+                    f"<td>{total['p99_ms']}</td><td>{total['max_ms']}</td>"
+                    f"<td><div class=\"hist\">{bars}</div></td></tr>")
+    return ("<h2>Latency</h2><table><tr><th>Endpoint</th><th>Requests</th><th>p50 ms</th>"
+            "<th>p90 ms</th><th>p99 ms</th><th>max ms</th><th>Distribution</th></tr>"
+            + "".join(rows) + "</table>")
+
+
+class HtmlReport:
+    """Incrementally built HTML page for one run."""
+
+    def __init__(self, title):
+        self.title = title
+        self.sections = {}
+
+    def add(self, result):
+        section = self.sections.get(result["classname"])
+        if section is None:
+            section = self.sections[result["classname"]] = Section(result["classname"])
+        section.add(result)
+
+    def render(self, path, latency=None, trends=None):
+        """Write the page; only sections with new results are re-rendered."""
+        body = [f"<h1>{escape(self.title)}</h1>", _trends_html(trends or []),
+                _latency_html(latency)]
+        body.extend(section.render() for section in self.sections.values())
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(f"<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+                         f"<title>{escape(self.title)}</title><style>{STYLE}</style></head>"
+                         f"<body>{''.join(body)}</body></html>")
+
+
+def history(reports_dir):
+    """Return ``[(run id, summary), ...]`` for the stored runs, oldest first."""
+    from common.reporting import list_runs
+    return [(os.path.basename(run_dir), run_summary(run_dir)) for run_dir in list_runs(reports_dir)]
+
+
+def render_run(run_dir, output=None):
+    """Render the HTML page of a stored run directory and return its path."""
+    from common.reporting import LATENCY, RESULTS, read_records
+    report = HtmlReport(f"Test run {os.path.basename(run_dir)}")
+    for result in read_records(os.path.join(run_dir, RESULTS)):
+        report.add(result)
+    latency = None
+    latency_path = os.path.join(run_dir, LATENCY)
+    if os.path.isfile(latency_path):
+        with open(latency_path, encoding="utf-8") as stored:
+            latency = json.load(stored)
+    reports_dir = os.path.dirname(os.path.dirname(os.path.abspath(run_dir)))
+    output = output or os.path.join(run_dir, HTML)
+    report.render(output, latency, history(reports_dir))
+    return output
+
+
+if __name__ == "__main__":
+    print(render_run(sys.argv[1]))
@@ -0,0 +1,107 @@
+"""Map test methods to the endpoints they touch, for test impact selection.
+
+While a test runs, every request the pooled client sends is attributed to it
+(``ApiTestCase`` marks the running test on its thread, and helpers that fan
+requests out to worker threads carry the mark with ``propagate``). The
+observed ``"METHOD /endpoint"`` pairs are stored in ``impact.json`` and used
+to pick the tests affected by a list of changed endpoints.
+"""
+import json
+import os
+import threading
+
+from common.metrics import endpoint_of
+
+INDEX = "impact.json"
+
+_current = threading.local()
+
+
+def test_id(test):
+    """Return ``"Class.method"`` for a ``TestCase`` instance."""
+    return f"{type(test).__name__}.{test._testMethodName}"
+
+
+def set_current(identifier):
+    _current.test = identifier
+
+
+def current():
+    return getattr(_current, "test", None)
+
+
+def propagate(function):
+    """Wrap ``function`` so it runs attributed to the test of the calling thread."""
+    identifier = current()
+
+    def attributed(*args, **kwargs):
+        previous = current()
+        set_current(identifier)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            set_current(previous)
+    return attributed
+
+
+class ImpactIndex:
+    """Thread-safe ``{test id: {"METHOD /endpoint", ...}}`` built from observed traffic."""
+
+    def __init__(self):
+        self.tests = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method, url):
+        identifier = current()
+        if identifier is None:
+            return
+        with self._lock:
+            self.tests.setdefault(identifier, set()).add(f"{method.upper()} {endpoint_of(url)}")
+
+    def save(self, path):
+        """Merge the observed endpoints into the index at ``path``.
+
+        Tests that ran replace their previous entry; tests that did not run keep it.
+        """
+        stored = load_index(path)
+        with self._lock:
+            stored.update({identifier: set(endpoints) for identifier, endpoints in self.tests.items()})
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump({identifier: sorted(endpoints) for identifier, endpoints in sorted(stored.items())},
+                      output, indent=2)
+
+
+index = ImpactIndex()
+
+
+def load_index(path):
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding="utf-8") as stored:
+        return {identifier: set(endpoints) for identifier, endpoints in json.load(stored).items()}
+
+
+def _matches(endpoint, change):
+    """``change`` is ``"METHOD /path"`` or just ``"/path"`` for any method."""
+    method, _, path = endpoint.partition(" ")
+    if " " in change:
+        change_method, _, change_path = change.partition(" ")
+        if change_method.upper() != method:
+            return False
+    else:
+        change_path = change
+    return endpoint_of(change_path) == path
+
+
+def affected(stored_index, identifiers, changes):
+    """Return the test ids among ``identifiers`` that must run for ``changes``.
+
+    Tests missing from the index have never been observed, so they always run.
+    """
+    selected = set()
+    for identifier in identifiers:
+        endpoints = stored_index.get(identifier)
+        if endpoints is None or any(_matches(endpoint, change)
+                                    for endpoint in endpoints for change in changes):
+            selected.add(identifier)
+    return selected
@@ -0,0 +1,167 @@
+"""Load generation reusing suite test methods as weighted scenarios.
+
+A scenario is a single test method, e.g. ``TestReqresAPIPut.test_large_payload``.
+Each iteration runs a fresh instance of it, so its payload and its assertions
+are the same ones the functional suites use. Iterations are driven either by a
+fixed number of concurrent workers (closed model) or at a target rate of
+iterations per second (open model), on threads sharing the pooled client.
+
+In the open model at most ``concurrency`` iterations are in flight; a start
+that finds them all busy is dropped and counted instead of being queued, and
+latency is measured from the scheduled start so a start that ran late shows
+its delay. Throughput is divided by the time the run actually took.
+"""
+import math
+import random
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from common.metrics import Histogram
+
+
+def parse_scenario(spec):
+    """Split ``"Class.method[=weight]"`` into ``("Class", "method", weight)``."""
+    name, _, weight = spec.partition("=")
+    classname, _, method = name.rpartition(".")
+    if not classname or not method:
+        raise ValueError(f"Scenario must look like Class.method[=weight]: {spec!r}")
+    return classname, method, float(weight) if weight else 1.0
+
+
+class Window:
+    """Outcome counters for one reporting interval."""
+
+    def __init__(self, start):
+        self.start = start
+        self.iterations = 0
+        self.errors = 0
+        self.latency = Histogram()
+
+    def summary(self, length):
+        summary = {"second": round(self.start, 1),
+                   "iterations": self.iterations,
+                   "throughput": round(self.iterations / length, 2),
+                   "error_rate": round(self.errors / self.iterations, 4) if self.iterations else 0.0}
+        summary.update(self.latency.summary())
+        return summary
+
+
+class LoadStats:
+    """Thread-safe per-scenario and per-interval aggregation."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.scenarios = {}
+        self.windows = {}
+        self._lock = threading.Lock()
+
+    def add(self, scenario, elapsed, ok):
+        offset = time.perf_counter() - self.started
+        index = int(offset // self.interval)
+        with self._lock:
+            window = self.windows.get(index)
+            if window is None:
+                window = self.windows[index] = Window(index * self.interval)
+            stats = self.scenarios.get(scenario)
+            if stats is None:
+                stats = self.scenarios[scenario] = Window(0)
+            for target in (window, stats):
+                target.iterations += 1
+                target.errors += 0 if ok else 1
+                target.latency.add(elapsed)
+
+    def report(self, duration, **counters):
+        with self._lock:
+            return {
+                "elapsed": round(duration, 3),
+                **counters,
+                "timeline": [self.windows[index].summary(self.interval)
+                             for index in sorted(self.windows)],
+                "scenarios": {name: stats.summary(duration)
+                              for name, stats in sorted(self.scenarios.items())},
+            }
+
+
+class LoadRunner:
+    """Run weighted scenarios for ``duration`` seconds."""
+
+    def __init__(self, scenarios, duration, concurrency=10, rps=None, interval=1.0):
+        # scenarios: [(test_class, method_name, weight), ...]
+        self.scenarios = scenarios
+        self.weights = [weight for _, _, weight in scenarios]
+        self.duration = duration
+        self.concurrency = concurrency
+        self.rps = rps
+        self.stats = LoadStats(interval)
+        # Open model counters: starts skipped because every worker was busy,
+        # and starts that began more than one tick after their schedule
+        self.dropped = 0
+        self.late = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _iteration(self, scheduled=None):
+        cls, method, _ = random.choices(self.scenarios, self.weights)[0]
+        result = unittest.TestResult()
+        start = time.perf_counter()
+        if scheduled is not None:
+            if start - scheduled > 1.0 / self.rps:
+                with self._lock:
+                    self.late += 1
+            start = scheduled
+        try:
+            cls(method).run(result)
+        finally:
+            if scheduled is not None:
+                with self._lock:
+                    self._in_flight -= 1
+        self.stats.add(f"{cls.__name__}.{method}", time.perf_counter() - start,
+                       result.wasSuccessful())
+
+    def _schedule(self, pool, deadline):
+        tick = 1.0 / self.rps
+        next_start = time.perf_counter()
+        while next_start < deadline and time.perf_counter() < deadline:
+            with self._lock:
+                busy = self._in_flight >= self.concurrency
+                if not busy:
+                    self._in_flight += 1
+            if busy:
+                self.dropped += 1
+            else:
+                pool.submit(self._iteration, next_start)
+            next_start += tick
+            time.sleep(max(next_start - time.perf_counter(), 0))
+        # Starts the scheduler fell too far behind to issue before the deadline
+        self.dropped += max(math.ceil((deadline - next_start) / tick), 0)
+
+    def _worker(self, deadline):
+        while time.perf_counter() < deadline:
+            self._iteration()
+
+    def run(self):
+        classes = {cls for cls, _, _ in self.scenarios}
+        for cls in classes:
+            cls.setUpClass()
+        try:
+            start = time.perf_counter()
+            deadline = start + self.duration
+            pool = ThreadPoolExecutor(max_workers=self.concurrency)
+            try:
+                if self.rps:
+                    # Open model: start iterations on schedule whether or not
+                    # earlier ones have finished, up to ``concurrency`` at once.
+                    self._schedule(pool, deadline)
+                else:
+                    for _ in range(self.concurrency):
+                        pool.submit(self._worker, deadline)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+            elapsed = time.perf_counter() - start
+        finally:
+            for cls in classes:
+                cls.tearDownClass()
+        return self.stats.report(elapsed, dropped=self.dropped, late=self.late)
@@ -0,0 +1,137 @@
+"""Cached manifest of the test methods in the suite files.
+
+Listing and filtering tests should not require importing the suites (and
+with them requests, urllib3 and the rest of the HTTP stack). The suite files
+are parsed with ``ast`` instead, and the tests found in each file are cached
+in ``manifest.json`` under the sha256 of the file's content, so a file is
+only parsed again after it changes. Each entry carries the module, class,
+method and tags (the names of its decorators, e.g. ``serial``), and the
+endpoints the test touched in earlier runs are added from ``impact.json``.
+
+This module only uses the standard library so that it stays cheap to import.
+"""
+import ast
+import hashlib
+import json
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SUITES = [
+    "TestReqresAPI.py",
+    "getapis/TestReqresAPIUnknown.py",
+    "postapis/userpost.py",
+    "putapis/userput.py",
+    "deleteapis/userdelete.py",
+]
+
+MANIFEST = "manifest.json"
+# Kept in sync with common.impact.INDEX, which is not imported to stay light
+IMPACT_INDEX = "impact.json"
+
+
+def module_name(path):
+    """Return the dotted module name a suite file is imported under."""
+    path = os.path.relpath(os.path.join(ROOT, path), ROOT)
+    return os.path.splitext(path.replace(os.sep, "."))[0]
+
+
+def _decorator_name(node):
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return None
+
+
+def _is_test_class(node):
+    for base in node.bases:
+        name = _decorator_name(base)
+        if name and name.endswith("TestCase"):
+            return True
+    return False
+
+
+def scan(path, source):
+    """Return the tests defined in one suite file, in unittest's (sorted) order."""
+    file = os.path.relpath(os.path.join(ROOT, path), ROOT)
+    module = module_name(path)
+    tests = []
+    for node in ast.parse(source, filename=file).body:
+        if not isinstance(node, ast.ClassDef) or not _is_test_class(node):
+            continue
+        class_tags = [name for name in map(_decorator_name, node.decorator_list) if name]
+        methods = [item for item in node.body
+                   if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                   and item.name.startswith("test")]
+        for method in sorted(methods, key=lambda item: item.name):
+            tags = class_tags + [name for name in map(_decorator_name, method.decorator_list)
+                                 if name]
+            tests.append({"file": file, "module": module, "class": node.name,
+                          "method": method.name, "tags": tags})
+    return tests
+
+
+def _read_json(path):
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as stored:
+            return json.load(stored)
+    except ValueError:
+        return {}
+
+
+def load(paths=SUITES, reports_dir="test-reports"):
+    """Return the manifest entries for ``paths``, re-parsing only changed files."""
+    manifest_path = os.path.join(reports_dir, MANIFEST)
+    cached = _read_json(manifest_path)
+    files = {}
+    for path in paths:
+        with open(os.path.join(ROOT, path), "rb") as suite:
+            source = suite.read()
+        digest = hashlib.sha256(source).hexdigest()
+        key = os.path.relpath(os.path.join(ROOT, path), ROOT)
+        entry = cached.get(key)
+        if entry is None or entry["sha256"] != digest:
+            entry = {"sha256": digest, "tests": scan(path, source)}
+        files[key] = entry
+    if files != {key: cached.get(key) for key in files}:
+        os.makedirs(reports_dir, exist_ok=True)
+        with open(manifest_path, "w", encoding="utf-8") as output:
+            json.dump({**cached, **files}, output, indent=2)
+
+    endpoints = _read_json(os.path.join(reports_dir, IMPACT_INDEX))
+    return [dict(test, endpoints=endpoints.get(test_id(test), []))
+            for entry in files.values() for test in entry["tests"]]
+
+
+def test_id(entry):
+    """Return ``"Class.method"``, the identifier used by the impact index."""
+    return f"{entry['class']}.{entry['method']}"
+
+
+def select(entries, keywords=None, tags=None):
+    """Keep the entries matching any keyword and carrying any of ``tags``.
+
+    A keyword matches case-insensitively anywhere in ``"module.Class.method"``.
+    """
+    if keywords:
+        keywords = [keyword.lower() for keyword in keywords]
+        entries = [entry for entry in entries
+                   if any(keyword in f"{entry['module']}.{test_id(entry)}".lower()
+                          for keyword in keywords)]
+    if tags:
+        entries = [entry for entry in entries if set(tags) & set(entry["tags"])]
+    return entries
+
+
+def format_entry(entry):
+    line = f"{entry['file']}::{test_id(entry)}"
+    if entry["tags"]:
+        line += f" [{', '.join(entry['tags'])}]"
+    if entry["endpoints"]:
+        line += f"  {', '.join(entry['endpoints'])}"
+    return line
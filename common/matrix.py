@@ -0,0 +1,97 @@
+"""Data-driven payload cases for the POST and PUT suites.
+
+A compact matrix of fields, value shapes and sizes is expanded lazily into
+named payloads, e.g. ``name=array[100],job=null``. ``send_cases`` pushes the
+cases through the pooled client in concurrent batches and yields each
+response in case order, so a test can assert every combination in its own
+``subTest`` without holding the whole matrix in memory.
+"""
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from common.client import check_snapshot, use_async_backend
+from common.impact import propagate
+
+# Shapes whose value depends on the size dimension
+SIZED_SHAPES = {
+    "string": lambda size: "a" * size,
+    "special": lambda size: ("!@#$%^&*()<>\"'\\/é中\U0001f600" * size)[:size],
+    "array": lambda size: [f"item{i}" for i in range(size)],
+    "object": lambda size: {f"key{i}": "value" for i in range(size)},
+}
+
+FIXED_SHAPES = {
+    "number": lambda size: 123,
+    "float": lambda size: 1.5,
+    "null": lambda size: None,
+    "boolean": lambda size: True,
+    "empty": lambda size: "",
+}
+
+# Sentinel shape: the field is left out of the payload
+MISSING = "missing"
+
+SHAPES = {**SIZED_SHAPES, **FIXED_SHAPES}
+
+
+def expand(fields, shapes, sizes=(1,)):
+    """Yield ``(case name, payload)`` for every combination, lazily and without duplicates.
+
+    ``shapes`` may contain names from ``SHAPES`` and ``MISSING``. Combinations
+    made only of unsized shapes are produced once instead of once per size.
+    """
+    for combination in itertools.product(shapes, repeat=len(fields)):
+        sized = any(shape in SIZED_SHAPES for shape in combination)
+        for size in sizes if sized else sizes[:1]:
+            payload = {}
+            labels = []
+            for field, shape in zip(fields, combination):
+                if shape == MISSING:
+                    labels.append(f"{field}={MISSING}")
+                    continue
+                payload[field] = SHAPES[shape](size)
+                label = f"{shape}[{size}]" if shape in SIZED_SHAPES else shape
+                labels.append(f"{field}={label}")
+            yield ",".join(labels), payload
+
+
+def send_cases(client, method, url, cases, workers=8, batch_size=64):
+    """Yield ``(name, payload, response_or_exception)`` for each case, in order.
+
+    Cases are pulled from the iterator ``batch_size`` at a time and each batch
+    is sent concurrently: on ``workers`` threads, or with the async backend as
+    ``batch_size`` requests in flight on its event loop.
+    """
+    def send(case):
+        name, payload = case
+        try:
+            return name, payload, client.request(method, url, json=payload)
+        except Exception as error:
+            return name, payload, error
+
+    cases = iter(cases)
+    if use_async_backend():
+        yield from _send_cases_async(client, method, url, cases, batch_size)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = list(itertools.islice(cases, batch_size))
+            if not batch:
+                return
+            yield from pool.map(propagate(send), batch)
+
+
+def _send_cases_async(client, method, url, cases, batch_size):
+    while True:
+        batch = list(itertools.islice(cases, batch_size))
+        if not batch:
+            return
+        futures = [client.submit(method, url, json=payload) for _, payload in batch]
+        for (name, payload), future in zip(batch, futures):
+            try:
+                response = future.result()
+            except Exception as error:
+                yield name, payload, error
+                continue
+            check_snapshot(method, response)
+            yield name, payload, response
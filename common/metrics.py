@@ -0,0 +1,229 @@
+"""Per-request latency instrumentation for the pooled client.
+
+Connection set-up is timed inside urllib3 connection subclasses installed on
+every host pool: DNS resolution, TCP connect and TLS handshake are measured
+separately and handed to the request being sent on the same thread. Together
+with time to first byte, total time and payload sizes they are aggregated per
+method and endpoint in log-bucketed histograms whose memory use does not grow
+with the number of requests.
+"""
+import json
+import math
+import re
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+PHASES = ("dns", "connect", "tls", "ttfb", "total")
+PERCENTILES = (50, 90, 99)
+
+# Buckets per power of two; 8 keeps percentile error below 9%
+BUCKETS_PER_OCTAVE = 8
+
+_current = threading.local()
+
+
+class Histogram:
+    """Log-bucketed histogram of durations in seconds, stored as microseconds."""
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        micros = max(seconds * 1e6, 1.0)
+        bucket = int(math.log2(micros) * BUCKETS_PER_OCTAVE)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        """Return the upper bound of the bucket holding ``percent`` of samples."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                upper = 2 ** ((bucket + 1) / BUCKETS_PER_OCTAVE) / 1e6
+                return min(upper, self.max)
+        return self.max
+
+    def buckets(self):
+        """Return ``[[upper bound ms, count], ...]`` for the non-empty buckets."""
+        return [[round(2 ** ((bucket + 1) / BUCKETS_PER_OCTAVE) / 1000, 3), self.counts[bucket]]
+                for bucket in sorted(self.counts)]
+
+    def summary(self):
+        """Return count, mean, percentiles and max in milliseconds."""
+        summary = {"count": self.count,
+                   "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0}
+        for percent in PERCENTILES:
+            summary[f"p{percent}_ms"] = round(self.percentile(percent) * 1000, 3)
+        summary["max_ms"] = round(self.max * 1000, 3)
+        return summary
+
+
+def endpoint_of(url):
+    """Return the URL path with numeric segments replaced by ``{id}``."""
+    path = urlsplit(url).path
+    return re.sub(r"/\d+(?=/|$)", "/{id}", path) or "/"
+
+
+class EndpointStats:
+    """Histograms and byte counters for one method and endpoint."""
+
+    def __init__(self):
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def summary(self):
+        summary = {phase: histogram.summary() for phase, histogram in self.phases.items()
+                   if histogram.count}
+        if self.phases["total"].count:
+            summary["total"]["histogram"] = self.phases["total"].buckets()
+        summary["bytes_sent"] = self.bytes_sent
+        summary["bytes_received"] = self.bytes_received
+        return summary
+
+
+class LatencyRecorder:
+    """Thread-safe aggregation of request timings keyed by ``"METHOD /endpoint"``."""
+
+    def __init__(self):
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def add(self, method, url, timings, bytes_sent, bytes_received):
+        key = f"{method.upper()} {endpoint_of(url)}"
+        with self._lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = EndpointStats()
+            for phase, seconds in timings.items():
+                stats.phases[phase].add(seconds)
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+
+    def summary(self):
+        with self._lock:
+            return {key: stats.summary() for key, stats in sorted(self.endpoints.items())}
+
+    def properties(self):
+        """Return flat ``{name: value}`` pairs for JUnit testsuite properties."""
+        properties = {}
+        for key, summary in self.summary().items():
+            total = summary.get("total")
+            if total:
+                properties[f"latency {key}"] = (
+                    f"n={total['count']} p50={total['p50_ms']}ms p90={total['p90_ms']}ms "
+                    f"p99={total['p99_ms']}ms max={total['max_ms']}ms")
+        return properties
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump(self.summary(), output, indent=2)
+
+
+recorder = LatencyRecorder()
+
+
+def start_request():
+    """Begin collecting connection timings for a request on this thread."""
+    _current.timings = {}
+    return _current.timings
+
+
+def current_timings():
+    """Return the timings dict of the request being sent on this thread."""
+    timings = getattr(_current, "timings", None)
+    return timings if timings is not None else {}
+
+
+def _note(phase, seconds):
+    timings = getattr(_current, "timings", None)
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """``HTTPConnection`` that times DNS resolution and TCP connect separately.
+
+    Every resolved address is tried in turn, as urllib3 does, so a host whose
+    first address is unreachable (e.g. IPv6 on an IPv4-only machine) still
+    connects through the next one.
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = list(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(
+                host, self.port, allowed_gai_family(), socket.SOCK_STREAM)))
+        except OSError:
+            # Let urllib3 raise its usual NameResolutionError
+            addresses = [host]
+        resolved = time.perf_counter()
+        try:
+            for position, address in enumerate(addresses, 1):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (ConnectTimeoutError, NewConnectionError):
+                    if position == len(addresses):
+                        raise
+        finally:
+            self._dns_host = host
+        _note("dns", resolved - start)
+        _note("connect", time.perf_counter() - resolved)
+        return sock
+
+
+class TimedHTTPSConnection(TimedHTTPConnection, HTTPSConnection):
+    """``HTTPSConnection`` that also times the TLS handshake."""
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        timings = getattr(_current, "timings", None)
+        if timings is not None:
+            setup = timings.get("dns", 0.0) + timings.get("connect", 0.0)
+            timings["tls"] = max(time.perf_counter() - start - setup, 0.0)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+def instrument(adapter):
+    """Make ``adapter`` create timed connections; adapters without pools are left alone."""
+    poolmanager = getattr(adapter, "poolmanager", None)
+    if poolmanager is not None:
+        poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+    return adapter
@@ -0,0 +1,67 @@
+"""Streaming iteration over paginated Reqres-style collections.
+
+``iter_records`` follows ``page``/``total_pages`` lazily and yields one record
+at a time. The next ``prefetch`` pages are requested concurrently through the
+pooled client while the current page is consumed, so at most
+``prefetch + 1`` pages are held in memory whatever the size of the collection.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from common.impact import propagate
+from common.schema import validator
+
+
+class PaginationError(Exception):
+    """A page could not be fetched or did not match its schema."""
+
+
+def _fetch_page(client, url, page, validate):
+    response = client.get(url, params={"page": page})
+    if response.status_code != 200:
+        raise PaginationError(f"page {page}: expected status code 200, "
+                              f"got {response.status_code}")
+    body = response.json()
+    errors = validate(body) if validate else []
+    if errors:
+        raise PaginationError(f"page {page}: " + "; ".join(errors[:5]))
+    return body
+
+
+def iter_pages(client, url, prefetch=4, schema="users_page"):
+    """Yield each page body of the collection at ``url`` in order."""
+    validate = validator(schema) if schema else None
+    first = _fetch_page(client, url, 1, validate)
+    yield first
+    total_pages = first.get("total_pages", 1)
+    if total_pages <= 1:
+        return
+
+    fetch_page = propagate(_fetch_page)
+    # prefetch=0 still needs the page being read to be in flight
+    prefetch = max(prefetch, 1)
+    with ThreadPoolExecutor(max_workers=prefetch) as pool:
+        pending = deque()
+        next_page = 2
+        while pending or next_page <= total_pages:
+            while next_page <= total_pages and len(pending) < prefetch:
+                pending.append(pool.submit(fetch_page, client, url, next_page, validate))
+                next_page += 1
+            try:
+                body = pending.popleft().result()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+            if not body.get("data"):
+                # The collection shrank while it was being read
+                for future in pending:
+                    future.cancel()
+                return
+            yield body
+
+
+def iter_records(client, url, prefetch=4, schema="users_page"):
+    """Yield every record of the collection at ``url``, validating each page."""
+    for page in iter_pages(client, url, prefetch, schema):
+        yield from page["data"]
@@ -0,0 +1,180 @@
+"""Concurrent execution of the API suites.
+
+Test methods are I/O bound, so they are run on a thread pool sharing the
+pooled client. Methods decorated with ``common.base.serial`` are kept out of
+the pool and run one at a time once the concurrent phase has finished.
+"""
+import importlib.util
+import inspect
+import os
+import sys
+import threading
+import time
+import traceback
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from common.base import is_serial
+from common.manifest import ROOT, SUITES, module_name
+
+
+def load_module(path):
+    """Import a suite file by path; the suite folders are not packages."""
+    name = module_name(path)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def discover(paths=SUITES, only=None):
+    """Return ``[(test_class, [test_case, ...]), ...]`` for the given suite files.
+
+    ``only`` optionally restricts the tests to a set of ``"Class.method"`` ids.
+    """
+    loader = unittest.TestLoader()
+    found = []
+    for path in paths:
+        module = load_module(path)
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if issubclass(cls, unittest.TestCase) and cls.__module__ == module.__name__:
+                names = [name for name in loader.getTestCaseNames(cls)
+                         if only is None or f"{cls.__name__}.{name}" in only]
+                if names:
+                    found.append((cls, [cls(name) for name in names]))
+    return found
+
+
+class TestRecord:
+    """Outcome of a single test method."""
+
+    def __init__(self, test, outcome, elapsed, message=None, details=None, name=None):
+        self.classname = type(test).__name__
+        self.name = name or getattr(test, "_testMethodName", str(test))
+        self.file = os.path.relpath(inspect.getfile(type(test)), ROOT)
+        self.doc = test.shortDescription() if isinstance(test, unittest.TestCase) else None
+        self.outcome = outcome
+        self.elapsed = elapsed
+        self.message = message
+        self.details = details
+
+
+class ParallelResult(unittest.TestResult):
+    """Thread-safe ``TestResult`` streaming a ``TestRecord`` per test to a reporter."""
+
+    def __init__(self, reporter):
+        super().__init__()
+        self.reporter = reporter
+        # Time each test's next record is measured from: the test start, or
+        # the end of its previous subtest
+        self._marks = {}
+        self._with_subtests = set()
+        self._lock = threading.RLock()
+
+    def startTest(self, test):
+        with self._lock:
+            super().startTest(test)
+            self._marks[test.id()] = time.perf_counter()
+
+    def stopTest(self, test):
+        with self._lock:
+            super().stopTest(test)
+            self._marks.pop(test.id(), None)
+            self._with_subtests.discard(test.id())
+
+    def _record(self, test, outcome, err=None, reason=None, name=None):
+        now = time.perf_counter()
+        mark = self._marks.get(test.id())
+        elapsed = now - mark if mark is not None else 0.0
+        if mark is not None:
+            self._marks[test.id()] = now
+        message = details = None
+        if err is not None:
+            message = str(err[1])
+            details = "".join(traceback.format_exception(*err))
+        elif reason is not None:
+            message = reason
+        self.reporter.add(TestRecord(test, outcome, elapsed, message, details, name))
+
+    def addSuccess(self, test):
+        with self._lock:
+            super().addSuccess(test)
+            # A test reported through its subtests gets no extra case, so the
+            # suite time is not counted twice
+            if test.id() not in self._with_subtests:
+                self._record(test, "success")
+
+    def addFailure(self, test, err):
+        with self._lock:
+            super().addFailure(test, err)
+            self._record(test, "failure", err)
+
+    def addError(self, test, err):
+        with self._lock:
+            super().addError(test, err)
+            self._record(test, "error", err)
+
+    def addSkip(self, test, reason):
+        with self._lock:
+            super().addSkip(test, reason)
+            self._record(test, "skipped", reason=reason)
+
+    def addExpectedFailure(self, test, err):
+        with self._lock:
+            super().addExpectedFailure(test, err)
+            self._record(test, "success")
+
+    def addUnexpectedSuccess(self, test):
+        with self._lock:
+            super().addUnexpectedSuccess(test)
+            self._record(test, "failure", reason="Unexpected success")
+
+    def addSubTest(self, test, subtest, err):
+        with self._lock:
+            super().addSubTest(test, subtest, err)
+            # Every subtest is reported as its own case, passed or not
+            if err is None:
+                outcome = "success"
+            elif issubclass(err[0], test.failureException):
+                outcome = "failure"
+            else:
+                outcome = "error"
+            name = f"{test._testMethodName} {subtest._subDescription()}"
+            self._with_subtests.add(test.id())
+            self._record(test, outcome, err, name=name)
+
+    def add_class_error(self, cls, tests, err):
+        """Mark every test of ``cls`` as errored when its class fixture failed."""
+        with self._lock:
+            for test in tests:
+                self.errors.append((test, "".join(traceback.format_exception(*err))))
+                self.testsRun += 1
+                self._record(test, "error", err)
+
+
+def run(suites, workers, reporter):
+    """Run ``[(test_class, tests), ...]`` and return the ``ParallelResult``."""
+    result = ParallelResult(reporter)
+    ready = []
+    for cls, tests in suites:
+        try:
+            cls.setUpClass()
+        except Exception:
+            result.add_class_error(cls, tests, sys.exc_info())
+            continue
+        ready.append((cls, tests))
+
+    concurrent = [test for _, tests in ready for test in tests if not is_serial(test)]
+    exclusive = [test for _, tests in ready for test in tests if is_serial(test)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda test: test.run(result), concurrent))
+    for test in exclusive:
+        test.run(result)
+
+    for cls, tests in ready:
+        try:
+            cls.tearDownClass()
+        except Exception:
+            traceback.print_exc()
+    return result
@@ -0,0 +1,118 @@
+"""Client-side rate limiting and retry policy.
+
+* A token bucket per host caps the request rate so high-concurrency runs do
+  not trip the target's rate limiting.
+* Idempotent requests (never POST) that fail with a connection error, a read
+  timeout, 429 or a transient 5xx are retried with full-jitter exponential
+  backoff, honouring ``Retry-After``.
+* Retries draw from a run-wide budget (a fixed allowance plus a fraction of
+  all requests sent), so an unhealthy target cannot multiply the load.
+"""
+import random
+import threading
+import time
+
+from requests.exceptions import ConnectionError, ReadTimeout
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Blocking token bucket allowing ``rate`` requests per second with bursts of ``burst``."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available; return the time waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RetryBudget:
+    """Allows ``min_retries`` plus ``ratio`` retries per request sent."""
+
+    def __init__(self, ratio=0.1, min_retries=10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self):
+        with self._lock:
+            if self.retries < self.min_retries + self.ratio * self.requests:
+                self.retries += 1
+                return True
+            self.denied += 1
+            return False
+
+
+class RetryPolicy:
+    """Decides whether and when a failed attempt is retried."""
+
+    def __init__(self, max_retries=2, backoff=0.1, max_backoff=5.0, budget=None):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget or RetryBudget()
+
+    def should_retry(self, method, attempt, response=None, error=None):
+        if method.upper() not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+            return False
+        if error is not None:
+            retryable = isinstance(error, (ConnectionError, ReadTimeout))
+        else:
+            retryable = response.status_code in RETRY_STATUSES
+        return retryable and self.budget.try_spend()
+
+    def delay(self, attempt, response=None):
+        """Full-jitter exponential backoff, or the server's ``Retry-After`` if given."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class HostLimiters:
+    """Lazily created ``TokenBucket`` per host; no limiting when ``rate`` is 0."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.waited = 0.0
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        if not self.rate:
+            return
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        waited = bucket.acquire()
+        if waited:
+            with self._lock:
+                self.waited += waited
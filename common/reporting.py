@@ -0,0 +1,183 @@
+"""Streaming test reports with per-run history.
+
+Each run gets its own directory under ``test-reports/runs/<run id>/``. Test
+results are appended to ``results.jsonl`` there as soon as each test finishes,
+one JSON line per test, so nothing is buffered and a crashed run still leaves
+its partial results. When the run ends the lines are merged into a single
+JUnit file, written element by element, which is stored with the run and
+copied to ``test-reports/results.xml``. An HTML page (see
+``common.html_report``) is kept up to date from the same results. Only the
+newest ``history`` runs are kept.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from xml.sax.saxutils import XMLGenerator
+
+from common.html_report import HTML, HtmlReport, history, summarize, write_summary
+from common.metrics import recorder
+
+RESULTS = "results.jsonl"
+JUNIT = "results.xml"
+LATENCY = "latency.json"
+
+# testsuite attribute counting each non-successful outcome
+OUTCOME_COUNTERS = {"failure": "failures", "error": "errors", "skipped": "skipped"}
+
+
+def record_to_dict(record):
+    return {
+        "classname": record.classname,
+        "name": record.name,
+        "file": record.file,
+        "doc": record.doc,
+        "outcome": record.outcome,
+        "time": round(record.elapsed, 6),
+        "message": record.message,
+        "details": record.details,
+        "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+    }
+
+
+def read_records(path):
+    """Yield the result dictionaries of a ``results.jsonl`` file one at a time."""
+    with open(path, encoding="utf-8") as results:
+        for line in results:
+            if line.strip():
+                yield json.loads(line)
+
+
+def list_runs(reports_dir="test-reports"):
+    """Return the run directories under ``reports_dir``, oldest first."""
+    runs_dir = os.path.join(reports_dir, "runs")
+    if not os.path.isdir(runs_dir):
+        return []
+    return [os.path.join(runs_dir, name) for name in sorted(os.listdir(runs_dir))
+            if os.path.isfile(os.path.join(runs_dir, name, RESULTS))]
+
+
+class RunReporter:
+    """Collects test results for one run and produces its reports."""
+
+    def __init__(self, reports_dir="test-reports", history=20, html_interval=5.0):
+        self.reports_dir = reports_dir
+        self.history = history
+        # Seconds between refreshes of the HTML page while the run is going
+        self.html_interval = html_interval
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        self.run_dir = os.path.join(reports_dir, "runs", self.run_id)
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.results_path = os.path.join(self.run_dir, RESULTS)
+        self._file = open(self.results_path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.html = HtmlReport(f"Test run {self.run_id}")
+        self._html_rendered = time.monotonic()
+
+    def add(self, record):
+        """Append one finished test; safe to call from several threads."""
+        self.add_result(record_to_dict(record))
+
+    def add_result(self, result):
+        """Append a result dictionary, e.g. one reused from an earlier run."""
+        line = json.dumps(result)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.html.add(result)
+            if time.monotonic() - self._html_rendered >= self.html_interval:
+                self.html.render(os.path.join(self.run_dir, HTML))
+                self._html_rendered = time.monotonic()
+
+    def finish(self, properties=None):
+        """Write the merged JUnit, latency and HTML reports and prune old runs."""
+        with self._lock:
+            self._file.close()
+        junit_path = os.path.join(self.run_dir, JUNIT)
+        write_junit(self.results_path, junit_path, properties)
+        shutil.copyfile(junit_path, os.path.join(self.reports_dir, JUNIT))
+        recorder.write_json(os.path.join(self.run_dir, LATENCY))
+        shutil.copyfile(os.path.join(self.run_dir, LATENCY),
+                        os.path.join(self.reports_dir, LATENCY))
+        write_summary(self.run_dir, summarize(read_records(self.results_path)))
+        self.prune()
+        html_path = os.path.join(self.run_dir, HTML)
+        self.html.render(html_path, recorder.summary(), history(self.reports_dir))
+        shutil.copyfile(html_path, os.path.join(self.reports_dir, HTML))
+        return junit_path
+
+    def prune(self):
+        """Delete the oldest runs beyond ``history``; the current run is always kept."""
+        for run_dir in list_runs(self.reports_dir)[:-max(self.history, 1)]:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def _suite_totals(results_path):
+    """First pass over the results: per-class counts in file order."""
+    totals = {}
+    for result in read_records(results_path):
+        suite = totals.setdefault(result["classname"], {
+            "file": result["file"], "tests": 0, "failures": 0, "errors": 0,
+            "skipped": 0, "time": 0.0, "timestamp": result["timestamp"]})
+        suite["tests"] += 1
+        suite["time"] += result["time"]
+        counter = OUTCOME_COUNTERS.get(result["outcome"])
+        if counter:
+            suite[counter] += 1
+    return totals
+
+
+def write_junit(results_path, output, properties=None):
+    """Merge a ``results.jsonl`` file into one JUnit XML file.
+
+    The file is streamed: one pass counts tests per class for the
+    ``<testsuite>`` attributes, then one pass per class writes its cases, so
+    memory use does not depend on the number of tests.
+    """
+    totals = _suite_totals(results_path)
+    with open(output, "w", encoding="utf-8") as stream:
+        xml = XMLGenerator(stream, encoding="UTF-8", short_empty_elements=False)
+        xml.startDocument()
+        xml.startElement("testsuites", {})
+        for classname, suite in totals.items():
+            stream.write("\n\t")
+            xml.startElement("testsuite", {
+                "name": classname, "tests": str(suite["tests"]), "file": suite["file"],
+                "time": f"{suite['time']:.3f}", "timestamp": suite["timestamp"],
+                "failures": str(suite["failures"]), "errors": str(suite["errors"]),
+                "skipped": str(suite["skipped"]),
+            })
+            if properties:
+                stream.write("\n\t\t")
+                xml.startElement("properties", {})
+                for key, value in properties.items():
+                    stream.write("\n\t\t\t")
+                    xml.startElement("property", {"name": key, "value": str(value)})
+                    xml.endElement("property")
+                stream.write("\n\t\t")
+                xml.endElement("properties")
+            for result in read_records(results_path):
+                if result["classname"] == classname:
+                    stream.write("\n\t\t")
+                    _write_case(xml, result)
+            stream.write("\n\t")
+            xml.endElement("testsuite")
+        stream.write("\n")
+        xml.endElement("testsuites")
+        xml.endDocument()
+
+
+def _write_case(xml, result):
+    xml.startElement("testcase", {
+        "classname": result["classname"], "name": result["name"],
+        "time": f"{result['time']:.3f}", "timestamp": result["timestamp"],
+        "file": result["file"],
+    })
+    if result["outcome"] in ("failure", "error", "skipped"):
+        xml.startElement(result["outcome"], {"type": result["outcome"],
+                                             "message": result["message"] or ""})
+        xml.characters(result["details"] or "")
+        xml.endElement(result["outcome"])
+    xml.endElement("testcase")
@@ -0,0 +1,84 @@
+"""Declarative response schemas compiled into validator functions.
+
+A schema is written with plain Python values:
+
+    int, str, ...        the value must be an instance of that type
+    (int, float)         the value must be an instance of any of the types
+    object               any value, including None
+    {"key": schema}      a dict that must contain every listed key
+    [schema]             a list whose every item matches ``schema``
+
+``compile_schema`` turns a schema into a function returning the list of
+failures as ``"path: message"`` strings (e.g. ``data[3].email: expected str,
+got int``). Named schemas from ``common.schemas`` are compiled once and
+cached by ``validator``.
+"""
+from functools import lru_cache
+
+
+def _type_names(types):
+    return " or ".join(t.__name__ for t in types)
+
+
+def _compile(schema, path):
+    if schema is object:
+        return lambda value, errors, where: None
+
+    if isinstance(schema, type):
+        schema = (schema,)
+
+    if isinstance(schema, tuple):
+        types = schema
+        # bool is a subclass of int, but JSON true is not a number
+        reject_bool = bool not in types
+
+        def check_type(value, errors, where):
+            if not isinstance(value, types) or (reject_bool and isinstance(value, bool)):
+                errors.append(f"{where or '<root>'}: expected {_type_names(types)}, "
+                              f"got {type(value).__name__}")
+        return check_type
+
+    if isinstance(schema, dict):
+        fields = [(key, _compile(sub, f"{path}.{key}")) for key, sub in schema.items()]
+
+        def check_dict(value, errors, where):
+            if not isinstance(value, dict):
+                errors.append(f"{where or '<root>'}: expected dict, got {type(value).__name__}")
+                return
+            for key, check in fields:
+                if key in value:
+                    check(value[key], errors, f"{where}.{key}" if where else key)
+                else:
+                    errors.append(f"{where or '<root>'}: missing key '{key}'")
+        return check_dict
+
+    if isinstance(schema, list) and len(schema) == 1:
+        check_item = _compile(schema[0], f"{path}[]")
+
+        def check_list(value, errors, where):
+            if not isinstance(value, list):
+                errors.append(f"{where or '<root>'}: expected list, got {type(value).__name__}")
+                return
+            for index, item in enumerate(value):
+                check_item(item, errors, f"{where}[{index}]")
+        return check_list
+
+    raise TypeError(f"Unsupported schema at {path or '<root>'}: {schema!r}")
+
+
+def compile_schema(schema):
+    """Return ``validate(value) -> [failure, ...]`` for ``schema``."""
+    check = _compile(schema, "")
+
+    def validate(value):
+        errors = []
+        check(value, errors, "")
+        return errors
+    return validate
+
+
+@lru_cache(maxsize=None)
+def validator(name):
+    """Return the compiled validator of the named schema in ``common.schemas``."""
+    from common import schemas
+    return compile_schema(schemas.SCHEMAS[name])
@@ -0,0 +1,21 @@
+"""Response schemas of the Reqres endpoints, see ``common.schema`` for the syntax."""
+
+SUPPORT = {"url": str, "text": str}
+
+USER = {"id": int, "email": str, "first_name": str, "last_name": str, "avatar": str}
+
+RESOURCE = {"id": int, "name": str, "year": int, "color": str, "pantone_value": str}
+
+SCHEMAS = {
+    # GET /api/users?page=N
+    "users_page": {"page": int, "per_page": int, "total": int, "total_pages": int,
+                   "data": [USER]},
+    # GET /api/users/{id}
+    "user": {"data": USER, "support": SUPPORT},
+    # GET /api/unknown/{id}
+    "resource": {"data": RESOURCE, "support": SUPPORT},
+    # POST /api/users; name and job echo whatever was sent
+    "user_created": {"name": object, "job": object, "id": str, "createdAt": str},
+    # PUT /api/users/{id}
+    "user_updated": {"name": object, "job": object, "updatedAt": str},
+}
@@ -0,0 +1,205 @@
+"""In-process stand-in for the parts of reqres.in exercised by the suites.
+
+Emulates ``/api/users``, ``/api/users/{id}`` and ``/api/unknown[/{id}]`` with
+the status codes and fields the tests assert, so the suites can run offline
+with sub-millisecond responses.
+
+Run standalone with ``python -m common.server [--port 8000]``, or let the
+suites start it in a background thread with ``API_LOCAL_SERVER=1`` or
+``run_tests.py --local``.
+"""
+import argparse
+import gzip
+import itertools
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PER_PAGE = 6
+SUPPORT = {
+    "url": "https://reqres.in/#support-heading",
+    "text": "To keep ReqRes free, contributions towards server costs are appreciated!",
+}
+
+USERS = [
+    {"id": i, "email": f"{first.lower()}.{last.lower()}@reqres.in", "first_name": first,
+     "last_name": last, "avatar": f"https://reqres.in/img/faces/{i}-image.jpg"}
+    for i, (first, last) in enumerate([
+        ("George", "Bluth"), ("Janet", "Weaver"), ("Emma", "Wong"), ("Eve", "Holt"),
+        ("Charles", "Morris"), ("Tracey", "Ramos"), ("Michael", "Lawson"),
+        ("Lindsay", "Ferguson"), ("Tobias", "Funke"), ("Byron", "Fields"),
+        ("George", "Edwards"), ("Rachel", "Howell"),
+    ], start=1)
+]
+
+RESOURCES = [
+    {"id": i, "name": name, "year": year, "color": color, "pantone_value": pantone}
+    for i, (name, year, color, pantone) in enumerate([
+        ("cerulean", 2000, "#98B2D1", "15-4020"), ("fuchsia rose", 2001, "#C74375", "17-2031"),
+        ("true red", 2002, "#BF1932", "19-1664"), ("aqua sky", 2003, "#7BC4C4", "14-4811"),
+        ("tigerlily", 2004, "#E2583E", "17-1456"), ("blue turquoise", 2005, "#53B0AE", "15-5217"),
+        ("sand dollar", 2006, "#DECDBE", "13-1106"), ("chili pepper", 2007, "#9B1B30", "19-1557"),
+        ("blue iris", 2008, "#5A5B9F", "18-3943"), ("mimosa", 2009, "#F0C05A", "14-0848"),
+        ("turquoise", 2010, "#45B5AA", "15-5519"), ("honeysuckle", 2011, "#D94F70", "18-2120"),
+    ], start=1)
+]
+
+COLLECTIONS = {"users": USERS, "unknown": RESOURCES}
+ROUTE = re.compile(r"^/api/(?P<collection>users|unknown)(?:/(?P<id>[^/]+))?/?$")
+
+_ids = itertools.count(100)
+_ids_lock = threading.Lock()
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _page(items, query):
+    try:
+        page = int(query.get("page", ["1"])[0])
+    except ValueError:
+        page = 1
+    total = len(items)
+    start = (page - 1) * PER_PAGE
+    return {
+        "page": page,
+        "per_page": PER_PAGE,
+        "total": total,
+        "total_pages": -(-total // PER_PAGE),
+        "data": items[start:start + PER_PAGE] if page > 0 else [],
+        "support": SUPPORT,
+    }
+
+
+class ReqresHandler(BaseHTTPRequestHandler):
+    """Routes requests to the emulated endpoints."""
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY every
+    # keep-alive response waits for the client's delayed ACK (~40 ms).
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if raw and self.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        if not raw:
+            return {}
+        return json.loads(raw)
+
+    def _send(self, status, body=None):
+        payload = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        # Time spent handling the request, for client-side benchmarks
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        self.send_header("Server-Timing", f"app;dur={elapsed_ms:.3f}")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _route(self):
+        parts = urlsplit(self.path)
+        match = ROUTE.match(parts.path)
+        if match is None:
+            return None, None, parse_qs(parts.query)
+        return match.group("collection"), match.group("id"), parse_qs(parts.query)
+
+    def _handle(self):
+        self._started = time.perf_counter()
+        try:
+            body = self._read_body()
+        except (ValueError, OSError):
+            return self._send(400, {"error": "Invalid request body"})
+        collection, item_id, query = self._route()
+        if collection is None:
+            return self._send(404, {})
+        handler = getattr(self, f"_{self.command.lower()}", None)
+        if handler is None:
+            return self._send(405, {})
+        return handler(collection, item_id, query, body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def _get(self, collection, item_id, query, body):
+        items = COLLECTIONS[collection]
+        if item_id is None:
+            return self._send(200, _page(items, query))
+        for item in items:
+            if str(item["id"]) == item_id:
+                return self._send(200, {"data": item, "support": SUPPORT})
+        return self._send(404, {})
+
+    def _post(self, collection, item_id, query, body):
+        if item_id is not None:
+            return self._send(405, {})
+        if not isinstance(body, dict) or "name" not in body or "job" not in body:
+            return self._send(400, {"error": "Missing name or job"})
+        with _ids_lock:
+            new_id = next(_ids)
+        return self._send(201, {**body, "id": str(new_id), "createdAt": _timestamp()})
+
+    def _put(self, collection, item_id, query, body):
+        if item_id is None:
+            return self._send(405, {})
+        fields = body if isinstance(body, dict) else {}
+        updated = {key: fields[key] for key in ("name", "job") if key in fields}
+        return self._send(200, {**updated, "updatedAt": _timestamp()})
+
+    _patch = _put
+
+    def _delete(self, collection, item_id, query, body):
+        if item_id is None:
+            return self._send(405, {})
+        return self._send(204)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+class ReqresServer(ThreadingHTTPServer):
+    # The default backlog of 5 overflows when a parallel run opens its pool
+    # at once, and a dropped SYN is only retried after a second
+    request_queue_size = 128
+
+
+def start_server(host="127.0.0.1", port=0):
+    """Start a server on a daemon thread and return it; ``port=0`` picks a free port."""
+    server = ReqresServer((host, port), ReqresHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def server_origin(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def ensure_local_server():
+    """Return the origin of the shared in-process server, starting it once."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = start_server()
+        return server_origin(_server)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Reqres stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), ReqresHandler)
+    print(f"Serving Reqres stand-in on {server_origin(server)}/api")
+    server.serve_forever()
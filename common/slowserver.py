@@ -0,0 +1,141 @@
+"""Local endpoints that misbehave on purpose, for deterministic timeout tests.
+
+Modes:
+    ``stall_connect`` - the listen backlog is kept full, so TCP connects hang
+                        and clients hit their connect timeout.
+                        Skipped where a full backlog refuses connections.
+    ``slow_headers``  - the request is read, then the response is withheld
+                        for ``delay`` seconds (read timeout before any byte).
+    ``slow_body``     - headers are sent at once and the body trickles in
+                        with ``delay`` seconds between chunks.
+
+Use as a context manager::
+
+    with SlowServer("slow_headers", delay=1) as server:
+        server.session.get(server.url("/api/users"), timeout=0.05)
+
+Requests go through the server's own plain ``requests.Session`` so response
+caching and cassette replay never answer them in place of the slow endpoint.
+"""
+import socket
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+MODES = ("stall_connect", "slow_headers", "slow_body")
+
+# Enough to fill any listen backlog of 0; Linux accepts a single pending connection
+MAX_FILLERS = 16
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        stopped = self.server.stopped
+        delay = self.server.delay
+        if self.server.mode == "slow_headers" and stopped.wait(delay):
+            return
+        chunks = [b"{}"] if self.server.mode == "slow_headers" else [b"{", b'"a"', b":1", b"}"]
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(sum(len(chunk) for chunk in chunks)))
+            self.end_headers()
+            for index, chunk in enumerate(chunks):
+                if index and stopped.wait(delay):
+                    return
+                self.wfile.write(chunk)
+                self.wfile.flush()
+        except OSError:
+            # The client gave up, which is the point of these endpoints
+            pass
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _handle
+
+
+class SlowServer:
+    """Start an endpoint in one of ``MODES`` on a free local port."""
+
+    def __init__(self, mode, delay=1.0):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+        self.mode = mode
+        self.delay = delay
+        self.session = requests.Session()
+        self._httpd = None
+        self._listener = None
+        self._fillers = []
+
+    def start(self):
+        if self.mode == "stall_connect":
+            self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._listener.bind(("127.0.0.1", 0))
+            self._listener.listen(0)
+            self._fill_backlog()
+            self.address = self._listener.getsockname()
+        else:
+            self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+            self._httpd.daemon_threads = True
+            self._httpd.mode = self.mode
+            self._httpd.delay = self.delay
+            self._httpd.stopped = threading.Event()
+            # Short poll interval so stop() returns in milliseconds
+            threading.Thread(target=self._httpd.serve_forever, args=(0.01,), daemon=True).start()
+            self.address = self._httpd.server_address[:2]
+        return self
+
+    def _fill_backlog(self):
+        """Open connections that are never accepted until a connect stalls.
+
+        This relies on a full backlog silently dropping SYNs, as Linux does.
+        Where a full backlog refuses connections instead (e.g. Windows) or
+        never fills, connects cannot be stalled and the test is skipped.
+        """
+        address = self._listener.getsockname()
+        for _ in range(MAX_FILLERS):
+            filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            filler.settimeout(0.05)
+            try:
+                filler.connect(address)
+            except socket.timeout:
+                filler.close()
+                return
+            except ConnectionRefusedError:
+                filler.close()
+                self.stop()
+                raise unittest.SkipTest("A full listen backlog refuses connections on this "
+                                        "platform, so connects cannot be stalled")
+            self._fillers.append(filler)
+        self.stop()
+        raise unittest.SkipTest("Could not fill the listen backlog to stall connects")
+
+    def url(self, path="/"):
+        host, port = self.address
+        return f"http://{host}:{port}{path}"
+
+    def stop(self):
+        self.session.close()
+        if self._httpd is not None:
+            self._httpd.stopped.set()
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        for filler in self._fillers:
+            filler.close()
+        if self._listener is not None:
+            self._listener.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
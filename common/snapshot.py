@@ -0,0 +1,206 @@
+"""Snapshot baselines of response bodies.
+
+With snapshots enabled every response received through the pooled client is
+normalized into ``{"status": ..., "body": ...}``, with volatile fields (ids
+and timestamps) replaced by a placeholder naming their type, so a change of
+value is ignored but a change of type is not. In ``record`` mode the result
+becomes the baseline for the request; in ``check`` mode it is compared with
+the baseline and the differences are reported against the running test.
+
+Baselines live in a content-addressed store: each normalized response is
+written once as a gzip blob named by the sha256 of its canonical JSON under
+``<dir>/objects/``, and ``<dir>/index.json`` maps each request (as keyed by
+``common.cassette.exchange_key``) to a digest, so identical responses share
+one blob. Only the index is held in memory. A response whose digest equals
+the baseline's matches without reading anything from disk; the baseline
+blob is loaded and diffed structurally only on a mismatch.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+from common.cassette import exchange_key
+
+INDEX = "index.json"
+OBJECTS = "objects"
+
+VOLATILE_FIELDS = {"id", "createdAt", "updatedAt"}
+
+# Differences reported per response; the rest are summarized in a count
+MAX_DIFFERENCES = 10
+
+
+def mask(value):
+    """Return ``value`` with every volatile field replaced by ``"<type>"``."""
+    if isinstance(value, dict):
+        return {key: f"<{type(item).__name__}>" if key in VOLATILE_FIELDS else mask(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [mask(item) for item in value]
+    return value
+
+
+def normalize(response):
+    """Return the masked ``{"status", "body"}`` document for a response."""
+    try:
+        body = mask(response.json())
+    except ValueError:
+        body = response.text or None
+    return {"status": response.status_code, "body": body}
+
+
+def canonical(document):
+    return json.dumps(document, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _join(path, key):
+    return f"{path}.{key}" if path else str(key)
+
+
+def diff(expected, actual, path="", differences=None):
+    """Return ``"path: message"`` strings describing how ``actual`` differs.
+
+    Equal subtrees are skipped with a single comparison, so the cost depends
+    on the size of the change rather than the size of the documents.
+    """
+    if differences is None:
+        differences = []
+    if expected == actual or len(differences) > MAX_DIFFERENCES:
+        return differences
+    where = path or "<root>"
+    if type(expected) is not type(actual):
+        differences.append(f"{where}: expected {type(expected).__name__}, "
+                           f"got {type(actual).__name__}")
+    elif isinstance(expected, dict):
+        for key in sorted(expected.keys() - actual.keys()):
+            differences.append(f"{_join(path, key)}: missing")
+        for key in sorted(actual.keys() - expected.keys()):
+            differences.append(f"{_join(path, key)}: unexpected")
+        for key in sorted(expected.keys() & actual.keys()):
+            diff(expected[key], actual[key], _join(path, key), differences)
+    elif isinstance(expected, list):
+        if len(expected) != len(actual):
+            differences.append(f"{where}: expected {len(expected)} items, got {len(actual)}")
+        for position, (old, new) in enumerate(zip(expected, actual)):
+            diff(old, new, f"{path}[{position}]", differences)
+    else:
+        differences.append(f"{where}: expected {expected!r}, got {actual!r}")
+    return differences
+
+
+class SnapshotStore:
+    """Thread-safe baseline index over a directory of gzip blobs."""
+
+    def __init__(self, directory, mode="check"):
+        self.directory = directory
+        self.mode = mode
+        self.index = {}
+        index_path = os.path.join(directory, INDEX)
+        if os.path.isfile(index_path):
+            with open(index_path, encoding="utf-8") as stored:
+                self.index = json.load(stored)
+        self.checked = 0
+        self.matched = 0
+        self.added = 0
+        self.mismatched = 0
+        # {test id: ["METHOD /path: difference", ...]}
+        self.mismatches = {}
+        self._written = set()
+        self._lock = threading.Lock()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, OBJECTS, digest[:2], digest[2:] + ".json.gz")
+
+    def _write_blob(self, digest, data):
+        """Write a blob unless it exists; called without the lock held.
+
+        Blobs are content-addressed and moved into place atomically, so
+        threads writing the same digest at once produce the same file.
+        """
+        if digest in self._written:
+            return
+        path = self._blob_path(digest)
+        if not os.path.isfile(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(partial, "wb", compresslevel=6) as blob:
+                blob.write(data)
+            os.replace(partial, path)
+        with self._lock:
+            self._written.add(digest)
+
+    def load(self, digest):
+        with gzip.open(self._blob_path(digest), "rb") as blob:
+            return json.loads(blob.read())
+
+    def check(self, method, response, test=None):
+        """Record or compare the response; return the list of differences."""
+        request = response.request
+        key = exchange_key(method, request.url, request.body)
+        document = normalize(response)
+        data = canonical(document)
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self.checked += 1
+            baseline = self.index.get(key)
+            if baseline == digest:
+                self.matched += 1
+                return []
+            store = baseline is None or self.mode == "record"
+            if store:
+                self.added += baseline is None
+        if store:
+            self._write_blob(digest, data)
+            with self._lock:
+                self.index[key] = digest
+            return []
+        differences = diff(self.load(baseline), document)
+        if len(differences) > MAX_DIFFERENCES:
+            differences[MAX_DIFFERENCES:] = ["more differences omitted"]
+        label = key.rsplit(" ", 1)[0]
+        with self._lock:
+            self.mismatched += 1
+            self.mismatches.setdefault(test, []).extend(
+                f"{label}: {difference}" for difference in differences)
+        return differences
+
+    def take_mismatches(self, test):
+        """Return and forget the differences found for ``test``."""
+        with self._lock:
+            return self.mismatches.pop(test, [])
+
+    def stats(self):
+        with self._lock:
+            return {"checked": self.checked, "matched": self.matched, "new": self.added,
+                    "mismatched": self.mismatched}
+
+    def save(self):
+        """Write the index and delete the blobs it no longer references.
+
+        Blobs are already on disk; re-recording replaces digests in the index,
+        and the blobs of the replaced baselines are removed here.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            data = json.dumps(self.index, sort_keys=True, indent=0)
+            referenced = set(self.index.values())
+        path = os.path.join(self.directory, INDEX)
+        with open(path + ".tmp", "w", encoding="utf-8") as output:
+            output.write(data)
+        os.replace(path + ".tmp", path)
+        self.prune(referenced)
+
+    def prune(self, referenced):
+        objects = os.path.join(self.directory, OBJECTS)
+        if not os.path.isdir(objects):
+            return
+        for prefix in os.listdir(objects):
+            folder = os.path.join(objects, prefix)
+            for name in os.listdir(folder):
+                if prefix + name.split(".", 1)[0] not in referenced:
+                    os.remove(os.path.join(folder, name))
+                    self._written.discard(prefix + name.split(".", 1)[0])
+            if not os.listdir(folder):
+                os.rmdir(folder)
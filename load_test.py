@@ -0,0 +1,78 @@
+"""Drive suite test methods as a weighted load-test workload.
+
+Usage:
+    python load_test.py TestReqresAPIPost.test_long_strings_in_payload=3 \\
+        TestReqresAPIPut.test_large_payload=1 --duration 30 --concurrency 20
+    python load_test.py TestReqresAPIPut.test_successful_put --rps 50 --duration 10
+"""
+import argparse
+import json
+import sys
+
+from common import parallel
+from common.client import close_all
+from common.config import settings
+from common.load import LoadRunner, parse_scenario
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="+", help="Class.method[=weight] of a suite test method")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--concurrency", type=int, default=10,
+                        help="concurrent workers (upper bound of in-flight iterations with --rps)")
+    parser.add_argument("--rps", type=float, help="target iterations per second instead of "
+                                                   "a fixed number of busy workers")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="length in seconds of each timeline window")
+    parser.add_argument("--local", action="store_true", default=settings.local_server,
+                        help="run against the in-process Reqres stand-in server")
+    parser.add_argument("--max-retries", type=int, default=0,
+                        help="retries of idempotent requests on transient failures (default: 0, "
+                             "so errors and latencies are measured as they happen)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def resolve(specs):
+    """Map ``Class.method[=weight]`` specs to ``(test_class, method, weight)``."""
+    classes = {cls.__name__: cls for cls, _ in parallel.discover()}
+    scenarios = []
+    for spec in specs:
+        classname, method, weight = parse_scenario(spec)
+        cls = classes.get(classname)
+        if cls is None or not hasattr(cls, method):
+            raise SystemExit(f"Unknown scenario: {classname}.{method}")
+        scenarios.append((cls, method, weight))
+    return scenarios
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings.local_server = args.local
+    settings.max_retries = args.max_retries
+    runner = LoadRunner(resolve(args.scenarios), args.duration, args.concurrency,
+                        args.rps, args.interval)
+    report = runner.run()
+    close_all()
+
+    print(f"{'second':>8} {'iter/s':>9} {'errors':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    for window in report["timeline"]:
+        print(f"{window['second']:>8} {window['throughput']:>9} {window['error_rate']:>8.2%} "
+              f"{window['p50_ms']:>9} {window['p90_ms']:>9} {window['p99_ms']:>9}")
+    for name, summary in report["scenarios"].items():
+        print(f"{name}: {summary['iterations']} iterations, {summary['throughput']} iter/s, "
+              f"error rate {summary['error_rate']:.2%}, p99 {summary['p99_ms']} ms")
+    print(f"Elapsed {report['elapsed']}s", end="")
+    if args.rps:
+        print(f", {report['dropped']} starts dropped (all workers busy or schedule missed), "
+              f"{report['late']} started late", end="")
+    print()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Benchmark how POST/PUT latency scales with payload size.
+
+Usage:
+    python payload_benchmark.py --local
+    python payload_benchmark.py --method POST --dimension keys --sizes 100 10000 1000000 --gzip
+    python payload_benchmark.py --output curve.csv
+"""
+import argparse
+import csv
+import json
+import sys
+
+from common.base import target_origin
+from common.benchmark import DEFAULT_SIZES, DIMENSIONS, json_codecs, sweep
+from common.client import ApiClient, close_all
+from common.config import settings
+
+COLUMNS = ("dimension", "size", "codec", "gzip", "status", "encode_ms", "compress_ms",
+           "request_bytes", "wire_bytes", "ttfb_ms", "server_ms", "response_bytes",
+           "decode_ms", "total_ms")
+
+PATHS = {"PUT": "/api/users/2", "POST": "/api/users"}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--method", choices=sorted(PATHS), default="PUT")
+    parser.add_argument("--dimension", choices=DIMENSIONS, action="append",
+                        help="dimension to sweep; repeat for several (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        help="sizes to sweep for every selected dimension")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per point (median kept)")
+    parser.add_argument("--gzip", action="store_true",
+                        help="also send every payload gzip-compressed")
+    parser.add_argument("--codec", action="append",
+                        help="JSON codec to use (json, orjson, ujson); default: all installed")
+    parser.add_argument("--local", action="store_true", default=settings.local_server,
+                        help="run against the in-process Reqres stand-in server")
+    parser.add_argument("--max-retries", type=int, default=0,
+                        help="retries of idempotent requests on transient failures (default: 0, "
+                             "so errors and latencies are measured as they happen)")
+    parser.add_argument("--output", help="write the curve to a .csv or .json file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings.local_server = args.local
+    settings.max_retries = args.max_retries
+    codecs = json_codecs()
+    if args.codec:
+        unknown = set(args.codec) - set(codecs)
+        if unknown:
+            raise SystemExit(f"Codec not installed: {', '.join(sorted(unknown))}")
+        codecs = {name: codecs[name] for name in args.codec}
+    dimensions = args.dimension or DIMENSIONS
+    sizes = {dimension: args.sizes or DEFAULT_SIZES[dimension] for dimension in dimensions}
+
+    url = target_origin() + PATHS[args.method]
+    client = ApiClient(timeout=120)
+    rows = []
+    print(" ".join(f"{column:>14}" for column in COLUMNS))
+    for row in sweep(client, args.method, url, dimensions, sizes, codecs,
+                     (False, True) if args.gzip else (False,), args.repeat):
+        rows.append(row)
+        if row["error"]:
+            print(f"{row['dimension']:>14} {row['size']:>14} {row['codec']:>14} "
+                  f"{str(row['gzip']):>14} {row['error']}")
+        else:
+            print(" ".join(f"{str(row.get(column)):>14}" for column in COLUMNS))
+    close_all()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as output:
+            if args.output.endswith(".json"):
+                json.dump(rows, output, indent=2)
+            else:
+                writer = csv.DictWriter(output, fieldnames=COLUMNS + ("error",),
+                                        extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,19 @@
-import unittest
-import requests
-import xmlrunner
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if __name__ == "__main__":
+    import run_tests
+    sys.exit(run_tests.main([__file__] + sys.argv[1:]))
+
+import requests
 
-class TestReqresAPIPost(unittest.TestCase):
+from common.base import ApiTestCase, serial
+from common.matrix import MISSING, SHAPES, expand, send_cases
+from common.slowserver import SlowServer
+
+class TestReqresAPIPost(ApiTestCase):
     BASE_URL = "https://reqres.in/api/users"
 
     def test_successful_post(self):
@@ -12,7 +22,7 @@ class TestReqresAPIPost(unittest.TestCase):
             "name": "morpheus",
             "job": "leader"
         }
-        response = requests.post(self.BASE_URL, json=payload)
+        response = self.client.post(self.BASE_URL, json=payload)
         self.assertEqual(response.status_code, 201, "Expected status code 201")
         json_data = response.json()
         self.assertIn("id", json_data, "Response JSON does not contain 'id'")
@@ -24,17 +34,13 @@ class TestReqresAPIPost(unittest.TestCase):
             "name": "neo",
             "job": "the one"
         }
-        response = requests.post(self.BASE_URL, json=payload)
-        json_data = response.json()
-
-        # Expected keys in the response
-        expected_keys = ["name", "job", "id", "createdAt"]
-        self.assertTrue(all(key in json_data for key in expected_keys),
-                        "Response JSON does not have expected structure")
+        response = self.client.post(self.BASE_URL, json=payload)
+        self.assertMatchesSchema(response.json(), "user_created",
+                                 "Response JSON does not have expected structure")
 
     def test_post_with_empty_payload(self):
         """Test the API's behavior with an empty payload."""
-        response = requests.post(self.BASE_URL, json={})
+        response = self.client.post(self.BASE_URL, json={})
         self.assertEqual(response.status_code, 400, "Expected status code 400 for empty payload")
 
     def test_post_with_invalid_payload(self):
@@ -42,30 +48,29 @@ class TestReqresAPIPost(unittest.TestCase):
         payload = {
             "invalid_field": "value"
         }
-        response = requests.post(self.BASE_URL, json=payload)
+        response = self.client.post(self.BASE_URL, json=payload)
         self.assertEqual(response.status_code, 400, "Expected status code 400 for invalid payload")
 
     def test_timeout_scenario(self):
-        """Test the API's behavior under a timeout scenario."""
+        """Test that a read timeout is raised when the server withholds its response."""
         payload = {
             "name": "trinity",
             "job": "hacker"
         }
-        try:
-            response = requests.post(self.BASE_URL, json=payload, timeout=0.001)
-        except requests.exceptions.Timeout:
-            self.assertTrue(True, "Expected timeout exception was raised")
-        else:
-            self.fail("Timeout exception was not raised")
+        with SlowServer("slow_headers", delay=1) as server:
+            with self.assertRaises(requests.exceptions.ReadTimeout,
+                                   msg="Expected read timeout exception was not raised"):
+                server.session.post(server.url("/api/users"), json=payload, timeout=0.05)
 
+    @serial
     def test_duplicate_user_creation(self):
         """Test the API's response to creating a user with the same details more than once."""
         payload = {
             "name": "morpheus",
             "job": "leader"
         }
-        response1 = requests.post(self.BASE_URL, json=payload)
-        response2 = requests.post(self.BASE_URL, json=payload)
+        response1 = self.client.post(self.BASE_URL, json=payload)
+        response2 = self.client.post(self.BASE_URL, json=payload)
         self.assertEqual(response1.status_code, 201, "Expected status code 201 for the first request")
         self.assertEqual(response2.status_code, 201, "Expected status code 201 for the second request")
         self.assertNotEqual(response1.json()["id"], response2.json()["id"], "Expected different IDs for each creation")
@@ -77,7 +82,7 @@ class TestReqresAPIPost(unittest.TestCase):
             "name": long_string,
             "job": long_string
         }
-        response = requests.post(self.BASE_URL, json=payload)
+        response = self.client.post(self.BASE_URL, json=payload)
         self.assertEqual(response.status_code, 201, "Expected status code 201")
         json_data = response.json()
         self.assertIn("id", json_data, "Response JSON does not contain 'id'")
@@ -88,7 +93,7 @@ class TestReqresAPIPost(unittest.TestCase):
         payload = {
             "name": "missing job"
         }
-        response = requests.post(self.BASE_URL, json=payload)
+        response = self.client.post(self.BASE_URL, json=payload)
         self.assertEqual(response.status_code, 400, "Expected status code 400 for missing required fields")
 
     def test_post_with_additional_unspecified_fields(self):
@@ -98,18 +103,22 @@ class TestReqresAPIPost(unittest.TestCase):
             "job": "fields",
             "extra_field": "extra_value"
         }
-        response = requests.post(self.BASE_URL, json=payload)
+        response = self.client.post(self.BASE_URL, json=payload)
         self.assertEqual(response.status_code, 201, "Expected status code 201")
         json_data = response.json()
        # self.assertNotIn("extra_field", json_data, "Response JSON should not contain 'extra_field'")
         self.assertIn("id", json_data, "Response JSON does not contain 'id'")
         self.assertIn("createdAt", json_data, "Response JSON does not contain 'createdAt'")
 
-if __name__ == "__main__":
-    # Ensure the output directory exists
-    if not os.path.exists('test-reports'):
-        os.makedirs('test-reports')
-
-    # Run the tests and generate the XML report
-    with open('test-reports/results.xml', 'wb') as output:
-        unittest.main(testRunner=xmlrunner.XMLTestRunner(output=output), failfast=False, buffer=False, catchbreak=False)
+    def test_payload_matrix(self):
+        """Test the API's response for every combination of value shape and size, including missing fields."""
+        cases = expand(("name", "job"), list(SHAPES) + [MISSING], sizes=(1, 100, 1000))
+        for name, payload, response in send_cases(self.client, "POST", self.BASE_URL, cases):
+            with self.subTest(case=name):
+                self.assertNotIsInstance(response, Exception, f"Request failed: {response}")
+                if "name" in payload and "job" in payload:
+                    self.assertEqual(response.status_code, 201, f"Expected status code 201 for {name}")
+                    self.assertMatchesSchema(response.json(), "user_created")
+                else:
+                    self.assertEqual(response.status_code, 400,
+                                     f"Expected status code 400 for missing required fields in {name}")
@@ -0,0 +1,183 @@
+"""Run every Reqres API suite concurrently and write one merged JUnit report.
+
+Usage:
+    python run_tests.py [--workers N] [--backend requests|async] [--local] [--record | --replay] [--snapshot record|check] [--cache] [--changed ENDPOINT ...]
+                        [--list] [-k KEYWORD ...] [--tag TAG ...] [--reports-dir test-reports] [suite.py ...]
+
+Each suite file can also be run on its own and accepts the same options; it
+hands over to main() before its own imports, so listing stays as cheap there.
+
+Tests are listed and filtered from the cached manifest (common/manifest.py)
+without importing the suites; the HTTP stack and the reporter are only
+imported once tests are actually run.
+"""
+import argparse
+import os
+import sys
+import time
+
+from common import manifest
+from common.config import settings
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("suites", nargs="*", default=manifest.SUITES,
+                        help="suite files to run (default: all five suites)")
+    parser.add_argument("--workers", type=int, default=settings.workers,
+                        help="number of test methods run concurrently")
+    parser.add_argument("--reports-dir", default="test-reports",
+                        help="directory for results.xml, latency.json and run history")
+    parser.add_argument("--history", type=int, default=settings.report_history,
+                        help="number of past runs kept under <reports-dir>/runs")
+    parser.add_argument("--backend", choices=("requests", "async"), default=settings.backend,
+                        help="HTTP backend: blocking requests or the asyncio transport")
+    parser.add_argument("--local", action="store_true", default=settings.local_server,
+                        help="run against the in-process Reqres stand-in server")
+    parser.add_argument("--record", dest="cassette_mode", action="store_const", const="record",
+                        default=settings.cassette_mode,
+                        help="append every exchange to the cassette")
+    parser.add_argument("--replay", dest="cassette_mode", action="store_const", const="replay",
+                        help="serve responses from the cassette instead of the network")
+    parser.add_argument("--cassette", default=settings.cassette_path,
+                        help="path of the JSONL cassette (default: cassettes/requests.jsonl)")
+    parser.add_argument("--cache", action="store_true", default=settings.response_cache,
+                        help="reuse GET/HEAD responses across test methods")
+    parser.add_argument("--snapshot", choices=("record", "check"), default=settings.snapshot_mode,
+                        help="record response baselines, or check responses against them")
+    parser.add_argument("--snapshot-dir", default=settings.snapshot_dir,
+                        help="directory of the snapshot store (default: snapshots)")
+    parser.add_argument("--rate-limit", type=float, default=settings.rate_limit,
+                        help="maximum requests per second per host (0: unlimited)")
+    parser.add_argument("--max-retries", type=int, default=settings.max_retries,
+                        help="retries of idempotent requests on transient failures")
+    parser.add_argument("--list", action="store_true",
+                        help="list the selected tests with their tags and endpoints and exit")
+    parser.add_argument("-k", dest="keywords", action="append", metavar="KEYWORD",
+                        help="only run tests whose module.Class.method contains KEYWORD "
+                             "(case-insensitive; repeat to match any of several)")
+    parser.add_argument("--tag", dest="tags", action="append", metavar="TAG",
+                        help="only run tests with this decorator tag, e.g. serial")
+    parser.add_argument("--changed", nargs="+", metavar="ENDPOINT",
+                        help="only run tests touching these endpoints, e.g. 'GET /api/users' "
+                             "or '/api/users/{id}'; passed results of the other tests are "
+                             "reused from the previous run")
+    return parser.parse_args(argv)
+
+
+def select_tests(suites, changes, reports_dir):
+    """Split ``suites`` into the tests to run and the stored results to reuse.
+
+    A test is reused only if the impact index shows it does not touch any
+    changed endpoint and it passed in the previous run; everything else runs.
+    """
+    from common import impact
+    from common.reporting import RESULTS, list_runs, read_records
+
+    stored_index = impact.load_index(os.path.join(reports_dir, impact.INDEX))
+    identifiers = [impact.test_id(test) for _, tests in suites for test in tests]
+    selected = impact.affected(stored_index, identifiers, changes)
+
+    previous = {}
+    runs = list_runs(reports_dir)
+    if runs:
+        for result in read_records(os.path.join(runs[-1], RESULTS)):
+            identifier = f"{result['classname']}.{result['name'].split(' ')[0]}"
+            previous.setdefault(identifier, []).append(result)
+    for identifier in set(identifiers) - selected:
+        results = previous.get(identifier)
+        if not results or any(result["outcome"] in ("failure", "error") for result in results):
+            selected.add(identifier)
+
+    to_run = []
+    for cls, tests in suites:
+        tests = [test for test in tests if impact.test_id(test) in selected]
+        if tests:
+            to_run.append((cls, tests))
+    reused = [dict(result, reused=True) for identifier in sorted(set(identifiers) - selected)
+              for result in previous[identifier]]
+    return to_run, reused
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    entries = manifest.select(manifest.load(args.suites, args.reports_dir),
+                              args.keywords, args.tags)
+    if args.list:
+        for entry in entries:
+            print(manifest.format_entry(entry))
+        print(f"{len(entries)} tests", file=sys.stderr)
+        return 0
+    if not entries:
+        print("No tests selected", file=sys.stderr)
+        return 1
+
+    from common import impact, parallel
+    from common.base import REPORT_PROPERTIES
+    from common.client import close_all, connection_stats, get_snapshots, policy_stats
+    from common.reporting import RunReporter
+
+    settings.workers = args.workers
+    settings.backend = args.backend
+    settings.rate_limit = args.rate_limit
+    settings.snapshot_mode = args.snapshot
+    settings.snapshot_dir = args.snapshot_dir
+    settings.max_retries = args.max_retries
+    settings.response_cache = args.cache
+    settings.local_server = args.local
+    settings.cassette_mode = args.cassette_mode
+    settings.cassette_path = args.cassette
+
+    paths = [path for path in args.suites
+             if any(entry["file"] == os.path.relpath(os.path.join(manifest.ROOT, path),
+                                                     manifest.ROOT) for entry in entries)]
+    suites = parallel.discover(paths, {manifest.test_id(entry) for entry in entries})
+    reused = []
+    if args.changed:
+        suites, reused = select_tests(suites, args.changed, args.reports_dir)
+    reporter = RunReporter(args.reports_dir, args.history)
+    for stored in reused:
+        reporter.add_result(stored)
+    start = time.perf_counter()
+    result = parallel.run(suites, args.workers, reporter)
+    elapsed = time.perf_counter() - start
+    connections = connection_stats()
+    close_all()
+
+    for test, details in result.errors + result.failures:
+        print("=" * 70, file=sys.stderr)
+        print(f"{test.id()}", file=sys.stderr)
+        print(details, file=sys.stderr)
+
+    junit_path = reporter.finish(REPORT_PROPERTIES)
+    impact.index.save(os.path.join(args.reports_dir, impact.INDEX))
+    snapshots = get_snapshots()
+    if snapshots is not None:
+        snapshots.save()
+
+    print(f"Ran {result.testsRun} tests in {elapsed:.3f}s with {args.workers} workers",
+          file=sys.stderr)
+    for host, stats in connections.items():
+        print(f"{host}: {stats['requests']} requests over {stats['connections']} connections",
+              file=sys.stderr)
+    stats = policy_stats()
+    print(f"Retries: {stats['retries']} of {stats['requests']} requests "
+          f"({stats['retries denied by budget']} denied by budget), "
+          f"rate limit wait {stats['rate limit wait (s)']}s", file=sys.stderr)
+    if snapshots is not None:
+        stats = snapshots.stats()
+        print(f"Snapshots: {stats['checked']} responses checked, {stats['matched']} matched, "
+              f"{stats['new']} new, {stats['mismatched']} differed", file=sys.stderr)
+    if reused:
+        print(f"Reused {len(reused)} results from the previous run", file=sys.stderr)
+    print(f"Report: {junit_path}", file=sys.stderr)
+    if result.wasSuccessful():
+        print("OK", file=sys.stderr)
+        return 0
+    print(f"FAILED (failures={len(result.failures)}, errors={len(result.errors)})",
+          file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
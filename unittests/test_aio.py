@@ -0,0 +1,111 @@
+"""Offline tests for the asyncio backend, sent through ``ApiClient``."""
+import gzip
+import json
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.client import ApiClient, close_all, get_pool
+from common.config import settings
+from common.slowserver import SlowServer
+
+BODY = {"data": [{"id": number, "email": f"user{number}@reqres.in"} for number in range(50)]}
+
+
+class EncodingHandler(BaseHTTPRequestHandler):
+    """Answers with chunked, gzip or plain JSON, echoing the request's Accept-Encoding."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        body = json.dumps(dict(BODY, accept=self.headers.get("Accept-Encoding"))).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if self.path == "/gzip":
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        if self.path == "/chunked":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(body), 100):
+                chunk = body[start:start + 100]
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestAsyncBackend(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.saved = (settings.backend, settings.max_retries, settings.response_cache)
+        settings.backend = "async"
+        settings.max_retries = 0
+        settings.response_cache = False
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), EncodingHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.origin = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.client = ApiClient(timeout=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_all()
+        cls.server.shutdown()
+        cls.server.server_close()
+        settings.backend, settings.max_retries, settings.response_cache = cls.saved
+
+    def test_chunked_body(self):
+        """Test that a chunked body is reassembled."""
+        response = self.client.get(f"{self.origin}/chunked")
+        self.assertEqual(response.json()["data"], BODY["data"])
+
+    def test_gzip_body_and_accept_encoding(self):
+        """Test that gzip bodies are decoded and only decodable codings are advertised."""
+        response = self.client.get(f"{self.origin}/gzip")
+        self.assertEqual(response.json()["data"], BODY["data"])
+        self.assertEqual(response.json()["accept"], "gzip, deflate")
+
+    def test_default_accept_encoding_is_narrowed(self):
+        """Test that a br/zstd default from urllib3 is replaced by the codings decoded here."""
+        with mock.patch("common.aio.DEFAULT_ACCEPT_ENCODING", "gzip, deflate, br, zstd"):
+            response = self.client.get(f"{self.origin}/gzip",
+                                       headers={"Accept-Encoding": "gzip, deflate, br, zstd"})
+        self.assertEqual(response.json()["accept"], "gzip, deflate")
+
+    def test_keep_alive_reuses_one_connection(self):
+        """Test that sequential requests to one host share a single connection."""
+        before = get_pool(self.origin).connections_opened()
+        for _ in range(5):
+            self.assertEqual(self.client.get(f"{self.origin}/plain").status_code, 200)
+        self.assertLessEqual(get_pool(self.origin).connections_opened() - before, 1)
+
+    def test_withheld_headers_raise_read_timeout(self):
+        """Test that a response whose headers never arrive raises ReadTimeout."""
+        with SlowServer("slow_headers", delay=1) as server:
+            with self.assertRaisesRegex(requests.exceptions.ReadTimeout, "Read timed out"):
+                self.client.get(server.url("/api/users"), timeout=0.05)
+
+    def test_stalled_body_raises_connection_error(self):
+        """Test that a stalled body raises ConnectionError, as with the requests backend."""
+        with SlowServer("slow_body", delay=1) as server:
+            with self.assertRaisesRegex(requests.exceptions.ConnectionError,
+                                        "Read timed out") as caught:
+                self.client.get(server.url("/api/users"), timeout=0.05)
+        self.assertNotIsInstance(caught.exception, requests.exceptions.ReadTimeout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""Offline tests for paginated reads, against the in-process stand-in server."""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.client import ApiClient
+from common.paginate import iter_pages, iter_records
+from common.server import server_origin, start_server
+
+
+class TestIterPages(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = start_server()
+        cls.url = f"{server_origin(cls.server)}/api/users"
+        cls.client = ApiClient(timeout=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_every_prefetch_depth_reads_the_same_records(self):
+        """Test that prefetch 0, 1 and 4 all yield every record once, in order."""
+        expected = [record["id"] for record in iter_records(self.client, self.url, prefetch=4)]
+        self.assertEqual(len(expected), 12)
+        for prefetch in (0, 1):
+            with self.subTest(prefetch=prefetch):
+                records = iter_records(self.client, self.url, prefetch=prefetch)
+                self.assertEqual([record["id"] for record in records], expected)
+
+    def test_pages_are_yielded_in_order(self):
+        """Test that pages come back numbered 1..total_pages without prefetching."""
+        pages = [body["page"] for body in iter_pages(self.client, self.url, prefetch=0)]
+        self.assertEqual(pages, [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Unit tests for the retry and rate limiting policy (no network needed)."""
+import os
+import sys
+import time
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.policy import HostLimiters, RetryBudget, RetryPolicy, TokenBucket
+
+
+def make_response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_post_is_never_retried(self):
+        """Test that POST is not retried on transient statuses or connection errors."""
+        policy = RetryPolicy(max_retries=5)
+        self.assertFalse(policy.should_retry("POST", 0, make_response(503)))
+        self.assertFalse(policy.should_retry("post", 0, error=requests.exceptions.ConnectionError()))
+        self.assertEqual(policy.budget.retries, 0, "A refused retry must not spend the budget")
+
+    def test_idempotent_methods_retry_transient_failures_only(self):
+        """Test that idempotent methods retry 429/5xx and connection errors but not other statuses."""
+        policy = RetryPolicy(max_retries=5)
+        for method in ("GET", "HEAD", "PUT", "DELETE"):
+            self.assertTrue(policy.should_retry(method, 0, make_response(503)), method)
+        self.assertTrue(policy.should_retry("GET", 0, make_response(429)))
+        self.assertTrue(policy.should_retry("GET", 0, error=requests.exceptions.ReadTimeout()))
+        self.assertFalse(policy.should_retry("GET", 0, make_response(404)))
+        self.assertFalse(policy.should_retry("GET", 0, make_response(501)))
+
+    def test_retries_stop_at_max_retries(self):
+        """Test that no retry is allowed once max_retries attempts were retried."""
+        policy = RetryPolicy(max_retries=2)
+        self.assertTrue(policy.should_retry("GET", 1, make_response(503)))
+        self.assertFalse(policy.should_retry("GET", 2, make_response(503)))
+
+    def test_budget_denies_retries_once_spent(self):
+        """Test that retries are denied and counted once the budget is exhausted."""
+        budget = RetryBudget(ratio=0.5, min_retries=1)
+        policy = RetryPolicy(max_retries=5, budget=budget)
+        self.assertTrue(policy.should_retry("GET", 0, make_response(503)))
+        self.assertFalse(policy.should_retry("GET", 0, make_response(503)))
+        self.assertEqual((budget.retries, budget.denied), (1, 1))
+        # Each request sent adds ``ratio`` retries to the allowance
+        budget.count_request()
+        budget.count_request()
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+
+    def test_retry_after_is_honoured_and_capped(self):
+        """Test that Retry-After sets the delay, up to max_backoff."""
+        policy = RetryPolicy(backoff=0.1, max_backoff=5.0)
+        self.assertEqual(policy.delay(0, make_response(429, {"Retry-After": "3"})), 3.0)
+        self.assertEqual(policy.delay(0, make_response(503, {"Retry-After": "120"})), 5.0)
+
+    def test_backoff_is_jittered_within_the_exponential_bound(self):
+        """Test that without Retry-After the delay stays within backoff * 2 ** attempt."""
+        policy = RetryPolicy(backoff=0.1, max_backoff=5.0)
+        for attempt in range(8):
+            delay = policy.delay(attempt, make_response(503, {"Retry-After": "soon"}))
+            self.assertGreaterEqual(delay, 0.0)
+            self.assertLessEqual(delay, min(5.0, 0.1 * 2 ** attempt))
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_wait(self):
+        """Test that a burst is served immediately and the next token is waited for."""
+        bucket = TokenBucket(rate=50, burst=2)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        start = time.monotonic()
+        waited = bucket.acquire()
+        self.assertGreater(waited, 0.0)
+        self.assertGreaterEqual(time.monotonic() - start, 0.015)
+
+    def test_zero_rate_disables_limiting(self):
+        """Test that HostLimiters with rate 0 never waits."""
+        limiters = HostLimiters(rate=0, burst=1)
+        for _ in range(100):
+            limiters.acquire("http://example.test")
+        self.assertEqual(limiters.waited, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Unit tests for snapshot masking, diffing and storage (no network needed)."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.cassette import exchange_key
+from common.snapshot import OBJECTS, SnapshotStore, diff, mask
+
+
+def make_response(body, status=200, url="http://example.test/api/users/2"):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.request = requests.Request("GET", url).prepare()
+    return response
+
+
+class TestMaskAndDiff(unittest.TestCase):
+
+    def test_volatile_value_change_is_ignored(self):
+        """Test that a new id or timestamp of the same type is not a difference."""
+        old = mask({"id": 1, "createdAt": "2024-01-01", "name": "morpheus"})
+        new = mask({"id": 7, "createdAt": "2025-06-30", "name": "morpheus"})
+        self.assertEqual(diff(old, new), [])
+
+    def test_volatile_type_change_is_reported(self):
+        """Test that a volatile field changing type is reported, also inside lists."""
+        old = mask({"data": [{"id": 1}, {"id": 2}]})
+        new = mask({"data": [{"id": 1}, {"id": "2"}]})
+        self.assertEqual(diff(old, new), ["data[1].id: expected '<int>', got '<str>'"])
+
+    def test_value_and_type_changes_are_reported(self):
+        """Test that a changed value and a changed type are both reported with their path."""
+        old = {"data": {"email": "a@reqres.in", "page": 2}}
+        new = {"data": {"email": "b@reqres.in", "page": "2"}}
+        self.assertEqual(diff(old, new), [
+            "data.email: expected 'a@reqres.in', got 'b@reqres.in'",
+            "data.page: expected int, got str",
+        ])
+
+    def test_list_length_change_is_reported(self):
+        """Test that a shorter or longer list is reported along with item differences."""
+        self.assertEqual(diff({"data": [1, 2]}, {"data": [1, 2, 3]}),
+                         ["data: expected 2 items, got 3"])
+        self.assertEqual(diff([1, 2, 3], [1, 5]),
+                         ["<root>: expected 3 items, got 2", "[1]: expected 2, got 5"])
+
+    def test_missing_and_unexpected_keys_are_reported(self):
+        """Test that removed and added keys are reported."""
+        self.assertEqual(diff({"a": 1, "b": 2}, {"a": 1, "c": 3}),
+                         ["b: missing", "c: unexpected"])
+
+
+class TestSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_check_reports_differences_for_the_test(self):
+        """Test that a changed response is recorded against the test that received it."""
+        SnapshotStore(self.directory, "record").check(
+            "GET", make_response('{"data": {"id": 2, "email": "a@reqres.in"}}'))
+        store = SnapshotStore(self.directory, "check")
+        store.check("GET", make_response('{"data": {"id": 2, "email": "a@reqres.in"}}'), "T.a")
+        store.check("GET", make_response('{"data": {"id": 2, "email": "b@reqres.in"}}'), "T.b")
+        self.assertEqual(store.take_mismatches("T.a"), [])
+        self.assertEqual(store.take_mismatches("T.b"), [
+            "GET /api/users/2: body.data.email: expected 'a@reqres.in', got 'b@reqres.in'"])
+        self.assertEqual(store.stats()["mismatched"], 1)
+
+    def test_identical_responses_share_a_blob_and_stale_blobs_are_pruned(self):
+        """Test that identical responses are stored once and re-recording removes old blobs."""
+        def blobs():
+            objects = os.path.join(self.directory, OBJECTS)
+            return sum(len(files) for _, _, files in os.walk(objects))
+
+        store = SnapshotStore(self.directory, "record")
+        store.check("GET", make_response("{}", 404, "http://example.test/api/users/23"))
+        store.check("GET", make_response("{}", 404, "http://example.test/api/unknown/23"))
+        store.save()
+        self.assertEqual(blobs(), 1)
+
+        store = SnapshotStore(self.directory, "record")
+        store.check("GET", make_response('{"a": 1}', 404, "http://example.test/api/users/23"))
+        store.check("GET", make_response('{"a": 1}', 404, "http://example.test/api/unknown/23"))
+        store.save()
+        self.assertEqual(blobs(), 1)
+        key = exchange_key("GET", "http://example.test/api/users/23", None)
+        self.assertEqual(store.load(store.index[key]), {"status": 404, "body": {"a": 1}})
+
+
+if __name__ == "__main__":
+    unittest.main()